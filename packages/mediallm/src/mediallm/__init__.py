@@ -13,22 +13,66 @@ Example:
 
 """
 
-from .analysis.workspace_scanner import discover_media
-from .api import MediaLLM
-from .utils.data_models import Action
-from .utils.data_models import CommandEntry
-from .utils.data_models import CommandPlan
-from .utils.data_models import MediaIntent
-from .utils.exceptions import ConfigError
-from .utils.exceptions import ConstructionError
-from .utils.exceptions import ExecError
-from .utils.exceptions import ExecutionError
-from .utils.exceptions import MediaLLMError
-from .utils.exceptions import ParseError
-from .utils.exceptions import SecurityError
-from .utils.exceptions import TranslationError
-from .utils.exceptions import ValidationError
-from .utils.version import __version__
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from .analysis.workspace_scanner import discover_media
+    from .api import MediaLLM
+    from .utils.data_models import Action
+    from .utils.data_models import CommandEntry
+    from .utils.data_models import CommandPlan
+    from .utils.data_models import MediaIntent
+    from .utils.exceptions import ConfigError
+    from .utils.exceptions import ConstructionError
+    from .utils.exceptions import ExecError
+    from .utils.exceptions import ExecutionError
+    from .utils.exceptions import MediaLLMError
+    from .utils.exceptions import ParseError
+    from .utils.exceptions import SecurityError
+    from .utils.exceptions import TranslationError
+    from .utils.exceptions import ValidationError
+    from .utils.version import __version__
+
+# Public names are resolved on first access so that importing a submodule
+# (e.g. the CLI entry point) does not pull in the whole package.
+_LAZY_EXPORTS: dict[str, str] = {
+    "Action": ".utils.data_models",
+    "CommandEntry": ".utils.data_models",
+    "CommandPlan": ".utils.data_models",
+    "ConfigError": ".utils.exceptions",
+    "ConstructionError": ".utils.exceptions",
+    "ExecError": ".utils.exceptions",
+    "ExecutionError": ".utils.exceptions",
+    "MediaIntent": ".utils.data_models",
+    "MediaLLM": ".api",
+    "MediaLLMError": ".utils.exceptions",
+    "ParseError": ".utils.exceptions",
+    "SecurityError": ".utils.exceptions",
+    "TranslationError": ".utils.exceptions",
+    "ValidationError": ".utils.exceptions",
+    "__version__": ".utils.version",
+    "discover_media": ".analysis.workspace_scanner",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names lazily on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List public names, including those not yet imported."""
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "Action",
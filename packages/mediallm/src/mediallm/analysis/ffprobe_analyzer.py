@@ -3,21 +3,60 @@
 
 from __future__ import annotations
 
-import json
+import functools
 import logging
+import os
 import shutil
 import subprocess  # nosec B404: subprocess is used safely with explicit args and no shell
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Final
 
 # Import media extensions from constants
 from ..constants.media_formats import MEDIA_EXTENSIONS as MEDIA_EXTS
 
+# Optional in-process container parser; ffprobe is used when unavailable
+try:
+    from mutagen import File as MutagenFile
+except ImportError:
+    MutagenFile = None
+
 logger = logging.getLogger(__name__)
 
 # Security constants for subprocess execution
 DEFAULT_FFPROBE_TIMEOUT: Final[int] = 60  # 1 minute for metadata extraction
 MAX_FFPROBE_OUTPUT_SIZE: Final[int] = 1024 * 1024  # 1MB for metadata
+MAX_FFPROBE_WORKERS: Final[int] = 32  # Upper bound on concurrent ffprobe processes
+
+# Reverse lookup from lowercase extension (with dot) to media category
+_EXT_TO_CATEGORY: Final[dict[str, str]] = {ext: cat for cat, exts in MEDIA_EXTS.items() for ext in exts}
+
+
+@functools.cache
+def _get_ffprobe_path() -> str | None:
+    """Return the absolute path to ffprobe, resolved once per process."""
+    return shutil.which("ffprobe")
+
+
+def _parse_ffprobe_duration(output: str) -> float | None:
+    """Extract the duration value from ffprobe's fixed-shape JSON reply.
+
+    The reply for ``-show_entries format=duration -of json`` is always
+    ``{"format": {"duration": "12.345"}}``, so the value is sliced out
+    directly instead of running the full JSON parser.
+
+    Raises:
+        ValueError: If the duration value is present but malformed.
+    """
+    key_idx = output.find('"duration"')
+    if key_idx < 0:
+        return None
+    start = output.find('"', key_idx + len('"duration"'))
+    end = output.find('"', start + 1) if start >= 0 else -1
+    if start < 0 or end < 0:
+        raise ValueError("malformed duration entry")
+    return float(output[start + 1 : end])
 
 
 def _ffprobe_duration(path: Path, timeout: int | None = None) -> float | None:
@@ -30,18 +69,24 @@ def _ffprobe_duration(path: Path, timeout: int | None = None) -> float | None:
     Returns:
         Duration in seconds, or None if extraction fails.
     """
-    ffprobe_path = shutil.which("ffprobe")
+    ffprobe_path = _get_ffprobe_path()
     if ffprobe_path is None:
         logger.debug("ffprobe not found in PATH")
         return None
 
     effective_timeout = timeout or DEFAULT_FFPROBE_TIMEOUT
+    timed_out = threading.Event()
+
+    def _kill_on_timeout(proc: subprocess.Popen[bytes]) -> None:
+        timed_out.set()
+        proc.kill()
 
     try:
-        # Call ffprobe with explicit args, no shell, and timeout for security
-        result = subprocess.run(  # nosec B603, B607
+        # Call ffprobe with explicit args, no shell, and timeout for security.
+        # Output is read with an upper bound so oversized replies never get buffered.
+        proc = subprocess.Popen(  # nosec B603
             [
-                "ffprobe",
+                ffprobe_path,
                 "-v",
                 "error",
                 "-show_entries",
@@ -50,59 +95,129 @@ def _ffprobe_duration(path: Path, timeout: int | None = None) -> float | None:
                 "json",
                 str(path),
             ],
-            capture_output=True,
-            check=True,
-            text=True,
-            timeout=effective_timeout,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
+    except OSError as e:
+        logger.debug(f"OS error running ffprobe for {path}: {e}")
+        return None
+
+    watchdog = threading.Timer(effective_timeout, _kill_on_timeout, args=(proc,))
+    watchdog.start()
+    try:
+        output = proc.stdout.read(MAX_FFPROBE_OUTPUT_SIZE + 1) if proc.stdout else b""
 
         # Check output size limit
-        if len(result.stdout) > MAX_FFPROBE_OUTPUT_SIZE:
+        if len(output) > MAX_FFPROBE_OUTPUT_SIZE:
+            proc.kill()
+            proc.wait()
             logger.warning(f"ffprobe output exceeds size limit for {path}")
             return None
 
-        data = json.loads(result.stdout)
-        dur = data.get("format", {}).get("duration")
-        return float(dur) if dur is not None else None
-
+        returncode = proc.wait(timeout=effective_timeout)
     except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        timed_out.set()
+        returncode = None
+    finally:
+        watchdog.cancel()
+        if proc.stdout:
+            proc.stdout.close()
+
+    if timed_out.is_set():
         logger.warning(f"ffprobe timed out after {effective_timeout}s for {path}")
         return None
-    except json.JSONDecodeError as e:
-        logger.warning(f"Failed to parse ffprobe JSON output for {path}: {e}")
+    if returncode != 0:
+        logger.debug(f"ffprobe failed for {path} with exit code {returncode}")
         return None
-    except subprocess.CalledProcessError as e:
-        logger.debug(f"ffprobe failed for {path}: {e}")
+
+    try:
+        return _parse_ffprobe_duration(output.decode("utf-8", errors="replace"))
+    except ValueError as e:
+        logger.warning(f"Failed to parse ffprobe output for {path}: {e}")
         return None
-    except OSError as e:
-        logger.debug(f"OS error running ffprobe for {path}: {e}")
+
+
+def _mutagen_duration(path: Path) -> float | None:
+    """Read duration from the container header in-process using mutagen.
+
+    Returns None when mutagen is not installed or cannot parse the file.
+    """
+    if MutagenFile is None:
+        return None
+    try:
+        media = MutagenFile(str(path))
+        length = getattr(getattr(media, "info", None), "length", None)
+        return float(length) if length else None
+    except Exception as e:
+        logger.debug(f"mutagen could not read duration from {path}: {e}")
+        return None
+
+
+def _extract_duration(path: Path) -> float | None:
+    """Extract duration using mutagen when possible, falling back to ffprobe."""
+    duration = _mutagen_duration(path)
+    if duration is not None:
+        return duration
+    return _ffprobe_duration(path)
+
+
+def _entry_stat(entry: os.DirEntry[str]) -> os.stat_result | None:
+    """Return (cached) stat info for a directory entry, or None if it cannot be stat'ed."""
+    try:
+        return entry.stat()
+    except OSError:
         return None
 
 
+def _probe_durations(paths: list[Path]) -> list[float | None]:
+    """Extract durations for several media files concurrently.
+
+    Each ffprobe call blocks in a subprocess, so threads overlap the waits
+    without contention on the GIL. Concurrency is capped to avoid fork storms.
+    """
+    if not paths:
+        return []
+    max_workers = min(len(paths), MAX_FFPROBE_WORKERS, (os.cpu_count() or 1) * 4)
+    if max_workers == 1:
+        return [_extract_duration(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_extract_duration, paths))
+
+
 def discover_media_extended(cwd: Path | None = None) -> dict[str, object]:
     """Scan current directory for media files and extract context information."""
     base = cwd or Path.cwd()
-    files: list[Path] = [p for p in base.iterdir() if p.is_file()]
 
-    # Categorize files by media type using extension matching
-    videos = [p for p in files if p.suffix.lower() in MEDIA_EXTS["video"]]
-    audios = [p for p in files if p.suffix.lower() in MEDIA_EXTS["audio"]]
-    images = [p for p in files if p.suffix.lower() in MEDIA_EXTS["image"]]
+    # Categorize files by media type in a single pass over the directory.
+    # DirEntry caches the file type and stat result, avoiding repeated syscalls.
+    videos: list[os.DirEntry[str]] = []
+    audios: list[os.DirEntry[str]] = []
+    images: list[os.DirEntry[str]] = []
+    buckets = {"video": videos, "audio": audios, "image": images}
+    with os.scandir(base) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            bucket = buckets.get(_EXT_TO_CATEGORY.get(os.path.splitext(entry.name)[1].lower(), ""))
+            if bucket is not None:
+                bucket.append(entry)
 
     # Collect detailed metadata for videos and audio files
+    media_entries = videos + audios
+    media_paths = [Path(entry.path) for entry in media_entries]
+    stats = [_entry_stat(entry) for entry in media_entries]
+    durations = _probe_durations(media_paths)
     info = [
-        {
-            "path": str(p),
-            "size": p.stat().st_size if p.exists() else None,
-            "duration": _ffprobe_duration(p),
-        }
-        for p in videos + audios
+        {"path": entry.path, "size": st.st_size if st is not None else None, "duration": duration}
+        for entry, st, duration in zip(media_entries, stats, durations, strict=True)
     ]
 
     return {
         "cwd": str(base),
-        "videos": [str(p) for p in videos],
-        "audios": [str(p) for p in audios],
-        "images": [str(p) for p in images],
+        "videos": [entry.path for entry in videos],
+        "audios": [entry.path for entry in audios],
+        "images": [entry.path for entry in images],
         "info": info,
     }
@@ -3,23 +3,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import warnings
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 
-import httpx
-
 from .analysis.workspace_scanner import discover_media
 from .core.command_builder import construct_operations
-from .core.llm import LLM
-from .core.llm import OllamaAdapter
 from .core.task_router import dispatch_task
 from .utils.exceptions import ConfigError
 from .utils.exceptions import TranslationError
 from .utils.exceptions import ValidationError
 
 if TYPE_CHECKING:
+    from .core.llm import LLM
     from .utils.data_models import CommandPlan
 
 
@@ -57,7 +56,10 @@ class MediaLLM:
         self._working_dir = Path(working_dir) if working_dir else Path.cwd()
         self._timeout = timeout
         self._workspace: dict[str, Any] | None = None
+        self._workspace_lock = threading.Lock()
+        self._available_files_cache: tuple[dict[str, Any], dict[str, list[str]]] | None = None
         self._llm: LLM | None = None
+        self._llm_lock = threading.Lock()
         self._ollama_host = ollama_host
         self._model_name = model_name
 
@@ -103,6 +105,8 @@ class MediaLLM:
     def scan_workspace(self, directory: Path | str | None = None) -> dict[str, Any]:
         """Scan directory for media files and update the cached workspace.
 
+        Unlike lazy workspace initialization, this always performs a fresh scan.
+
         Args:
             directory: Directory to scan. Defaults to working_dir.
 
@@ -111,16 +115,29 @@ class MediaLLM:
         """
         scan_dir = Path(directory) if directory else self._working_dir
         self._workspace = discover_media(cwd=scan_dir, show_summary=False)
+        self._available_files_cache = None
         return self._workspace
 
     def _ensure_workspace(self) -> dict[str, Any]:
-        """Ensure workspace is initialized, scanning if needed."""
+        """Ensure workspace is initialized, scanning if needed.
+
+        Uses double-checked locking so concurrent callers (e.g. the async
+        methods) share a single scan instead of each walking the directory.
+        """
         if self._workspace is None:
-            self._workspace = discover_media(cwd=self._working_dir, show_summary=False)
+            with self._workspace_lock:
+                if self._workspace is None:
+                    self._workspace = discover_media(cwd=self._working_dir, show_summary=False)
         return self._workspace
 
     def _initialize_llm(self, ollama_host: str, model_name: str) -> LLM:
         """Initialize the LLM provider with specific error handling."""
+        # Deferred so that importing the package does not load the LLM stack
+        import httpx
+
+        from .core.llm import LLM
+        from .core.llm import OllamaAdapter
+
         try:
             # Import ollama for specific exception handling
             import ollama as ollama_module
@@ -163,9 +180,15 @@ class MediaLLM:
             raise ValidationError("Request too long (max 10000 characters)")
 
     def _get_llm(self) -> LLM:
-        """Get or create the LLM instance lazily."""
+        """Get or create the LLM instance lazily.
+
+        Uses double-checked locking so concurrent callers (e.g. the async
+        methods) share a single provider instead of each connecting to Ollama.
+        """
         if self._llm is None:
-            self._llm = self._initialize_llm(self._ollama_host, self._model_name)
+            with self._llm_lock:
+                if self._llm is None:
+                    self._llm = self._initialize_llm(self._ollama_host, self._model_name)
         return self._llm
 
     def generate_plan(
@@ -242,6 +265,84 @@ class MediaLLM:
         allowed_dirs = [self._working_dir]
         return construct_operations(plan, assume_yes=assume_yes, allowed_dirs=allowed_dirs)
 
+    async def agenerate_plan(
+        self,
+        request: str,
+        output_dir: Path | str | None = None,
+    ) -> CommandPlan:
+        """Asynchronously generate a command plan from natural language.
+
+        The blocking Ollama round-trip runs in a worker thread, so several
+        requests can be awaited concurrently (e.g. with ``asyncio.gather``).
+
+        Args:
+            request: Natural language description of the media operation.
+            output_dir: Optional directory for output files.
+
+        Returns:
+            CommandPlan containing the parsed operation details.
+
+        Raises:
+            ValidationError: If the request is invalid.
+            TranslationError: If the request cannot be parsed.
+            ConfigError: If there's an issue with the Ollama configuration.
+        """
+        return await asyncio.to_thread(self.generate_plan, request, output_dir)
+
+    async def agenerate_commands(
+        self,
+        request: str,
+        assume_yes: bool = True,
+        output_dir: Path | str | None = None,
+    ) -> list[list[str]]:
+        """Asynchronously generate executable FFmpeg commands from natural language.
+
+        Args:
+            request: Natural language description of the media operation.
+            assume_yes: If True, add -y flag to overwrite existing files.
+            output_dir: Optional directory for output files.
+
+        Returns:
+            List of FFmpeg commands, where each command is a list of arguments.
+        """
+        return await asyncio.to_thread(self.generate_commands, request, assume_yes, output_dir)
+
+    async def agenerate_many(
+        self,
+        requests: list[str],
+        assume_yes: bool = True,
+        output_dir: Path | str | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[list[list[str]]]:
+        """Generate FFmpeg commands for several requests concurrently.
+
+        Note: a local Ollama server backed by a single GPU typically processes
+        one generation at a time, so concurrency mostly overlaps network and
+        parsing overhead. Use ``max_concurrency`` to limit in-flight requests
+        (or raise ``OLLAMA_NUM_PARALLEL`` on the server).
+
+        Args:
+            requests: Natural language descriptions of media operations.
+            assume_yes: If True, add -y flag to overwrite existing files.
+            output_dir: Optional directory for output files.
+            max_concurrency: Maximum number of requests in flight. Unlimited if None.
+
+        Returns:
+            One list of FFmpeg commands per request, in the same order as ``requests``.
+        """
+        if max_concurrency is None:
+            return list(
+                await asyncio.gather(*(self.agenerate_commands(r, assume_yes, output_dir) for r in requests))
+            )
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _bounded(request: str) -> list[list[str]]:
+            async with semaphore:
+                return await self.agenerate_commands(request, assume_yes, output_dir)
+
+        return list(await asyncio.gather(*(_bounded(r) for r in requests)))
+
     def generate_command(
         self,
         request: str,
@@ -282,13 +383,22 @@ class MediaLLM:
         Note: This property calls scan_workspace() internally if workspace
         hasn't been scanned yet.
 
+        The returned view is cached until the workspace changes and should be
+        treated as read-only.
+
         Returns:
             Dictionary with keys 'videos', 'audios', 'images', 'subtitles'.
         """
         workspace = self._ensure_workspace()
-        return {
+        cached = self._available_files_cache
+        if cached is not None and cached[0] is workspace:
+            return cached[1]
+
+        files = {
             "videos": workspace.get("videos", []),
             "audios": workspace.get("audios", []),
             "images": workspace.get("images", []),
             "subtitles": workspace.get("subtitle_files", []),
         }
+        self._available_files_cache = (workspace, files)
+        return files
@@ -3,9 +3,12 @@
 
 from __future__ import annotations
 
+import itertools
+import os
 import re
-from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import Final
 
 from ..safety.data_protection import create_secure_logger
 from .action_inference import fix_action_validation_issues
@@ -13,8 +16,35 @@ from .action_inference import infer_action_from_query
 from .action_inference import infer_format_and_codec
 from .action_inference import infer_inputs_from_query
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 logger = create_secure_logger(__name__)
 
+# Markdown code blocks wrapping JSON (```json ... ``` or ``` ... ```)
+_MD_JSON_RE: Final[re.Pattern[str]] = re.compile(r"```json\s*([\s\S]*?)\s*```", re.IGNORECASE)
+_MD_BLOCK_RE: Final[re.Pattern[str]] = re.compile(r"```\s*([\s\S]*?)\s*```")
+
+# Inline comment patterns appended to paths: "file.ext - description", "file.ext (description)", ...
+_PATH_CLEAN_PATTERNS: Final[tuple[re.Pattern[str], ...]] = (
+    re.compile(r"\s*-\s+[^/\\]+$"),  # " - description"
+    re.compile(r"\s*\([^)]+\)\s*$"),  # " (description)"
+    re.compile(r"\s*#[^/\\]+$"),  # " # comment"
+    re.compile(r"\s*//[^/\\]+$"),  # " // comment"
+    re.compile(r"\s*:\s+[^/\\:]+$"),  # " : description"
+)
+_EXT_RE: Final[re.Pattern[str]] = re.compile(r"\.\w{2,5}$")
+_FILENAME_WITH_EXT_RE: Final[re.Pattern[str]] = re.compile(r"(\S+\.\w{2,5})")
+
+# Common malformed field values in model responses
+_NULL_ARRAY_RE: Final[re.Pattern[str]] = re.compile(r'"(filters|extra_flags|inputs)":\s*null')
+_SINGLE_TO_LIST_RE: Final[re.Pattern[str]] = re.compile(r'"(filters|extra_flags)":\s*"([^"]+)"')
+
+# Workspace file lists consulted when matching paths, and the suffix of their
+# optional precomputed lowercase counterparts (e.g. "videos_lower")
+_WORKSPACE_FILE_KEYS: Final[tuple[str, ...]] = ("videos", "audios", "images", "subtitle_files")
+LOWERCASE_KEY_SUFFIX: Final[str] = "_lower"
+
 
 class JSONRepair:
     """Handles JSON validation and repair for LLM responses."""
@@ -26,27 +56,25 @@ class JSONRepair:
         LLMs sometimes embed JSON within explanatory text or markdown code blocks.
         This method extracts the JSON portion from such responses.
         """
-        if not text:
+        # Fast path for empty or clean model output: skip strip() and its copy entirely
+        if not text or (text[0] == "{" and text[-1] == "}"):
             return text
 
         text = text.strip()
 
-        # If it already looks like valid JSON, return as-is
-        if text.startswith("{") and text.endswith("}"):
+        # Return as-is if it already looks like valid JSON, or has no brace to extract from
+        if "{" not in text or (text.startswith("{") and text.endswith("}")):
             return text
 
         # Try to extract from markdown code blocks (```json ... ``` or ``` ... ```)
-        markdown_patterns = [
-            r"```json\s*([\s\S]*?)\s*```",
-            r"```\s*([\s\S]*?)\s*```",
-        ]
-        for pattern in markdown_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                extracted = match.group(1).strip()
-                if extracted.startswith("{"):
-                    logger.debug("Extracted JSON from markdown code block")
-                    return extracted
+        if "```" in text:
+            for pattern in (_MD_JSON_RE, _MD_BLOCK_RE):
+                match = pattern.search(text)
+                if match:
+                    extracted = match.group(1).strip()
+                    if extracted.startswith("{"):
+                        logger.debug("Extracted JSON from markdown code block")
+                        return extracted
 
         # Try to find JSON object between first { and last }
         first_brace = text.find("{")
@@ -69,11 +97,12 @@ class JSONRepair:
         This method cleans these up to valid paths.
         """
         path_fields = ["output", "subtitle_path", "overlay_path"]
+        name_index, path_index = JSONRepair._build_workspace_index(workspace)
 
         for field in path_fields:
             value = data.get(field)
             if value and isinstance(value, str):
-                cleaned = JSONRepair._clean_path_string(value, workspace)
+                cleaned = JSONRepair._clean_path_string(value, name_index, path_index)
                 if cleaned != value:
                     logger.debug(f"Sanitized {field}: '{value}' -> '{cleaned}'")
                     data[field] = cleaned
@@ -83,7 +112,7 @@ class JSONRepair:
             cleaned_inputs = []
             for inp in data["inputs"]:
                 if isinstance(inp, str):
-                    cleaned = JSONRepair._clean_path_string(inp, workspace)
+                    cleaned = JSONRepair._clean_path_string(inp, name_index, path_index)
                     cleaned_inputs.append(cleaned)
                 else:
                     cleaned_inputs.append(inp)
@@ -92,7 +121,39 @@ class JSONRepair:
         return data
 
     @staticmethod
-    def _clean_path_string(path_str: str, workspace: dict[str, Any]) -> str:
+    def _build_workspace_index(workspace: dict[str, Any]) -> tuple[dict[str, str], list[tuple[str, str]]]:
+        """Build lookup tables of workspace files for path matching.
+
+        Returns a mapping of lowercase filename to workspace path (first occurrence
+        wins) and a list of (lowercase path, path) pairs for substring matching.
+
+        A scanner may precompute lowercase paths under "<key>_lower" (e.g.
+        "videos_lower", "audios_lower", "images_lower", "subtitle_files_lower"),
+        parallel to each file list; otherwise they are computed here.
+        """
+        name_index: dict[str, str] = {}
+        path_index: list[tuple[str, str]] = []
+        workspace_files = itertools.chain.from_iterable(
+            JSONRepair._lowercased_files(workspace, key) for key in _WORKSPACE_FILE_KEYS
+        )
+        for ws_file_str, ws_file_lower in workspace_files:
+            name_index.setdefault(os.path.basename(ws_file_lower), ws_file_str)
+            path_index.append((ws_file_lower, ws_file_str))
+        return name_index, path_index
+
+    @staticmethod
+    def _lowercased_files(workspace: dict[str, Any], key: str) -> Iterable[tuple[str, str]]:
+        """Pair each workspace file under key with its lowercase form."""
+        files = [str(f) for f in workspace.get(key, [])]
+        lowered = workspace.get(f"{key}{LOWERCASE_KEY_SUFFIX}")
+        if not isinstance(lowered, list) or len(lowered) != len(files):
+            lowered = [f.lower() for f in files]
+        return zip(files, lowered, strict=True)
+
+    @staticmethod
+    def _clean_path_string(
+        path_str: str, name_index: dict[str, str], path_index: list[tuple[str, str]]
+    ) -> str:
         """Clean a single path string by removing embedded text."""
         if not path_str:
             return path_str
@@ -100,53 +161,45 @@ class JSONRepair:
         original = path_str
 
         # Remove common inline comment patterns
-        # Pattern: "file.ext - description" or "file.ext (description)"
-        patterns_to_remove = [
-            r"\s*-\s+[^/\\]+$",           # " - description"
-            r"\s*\([^)]+\)\s*$",          # " (description)"
-            r"\s*#[^/\\]+$",              # " # comment"
-            r"\s*//[^/\\]+$",             # " // comment"
-            r"\s*:\s+[^/\\:]+$",          # " : description"
-        ]
-
-        for pattern in patterns_to_remove:
-            path_str = re.sub(pattern, "", path_str)
+        for pattern in _PATH_CLEAN_PATTERNS:
+            path_str = pattern.sub("", path_str)
 
         # If the entire string looks like a description (no file extension), try to extract filename
-        if not re.search(r"\.\w{2,5}$", path_str):
+        if not _EXT_RE.search(path_str):
             # Try to find a filename with extension in the original string
-            ext_match = re.search(r"(\S+\.\w{2,5})", original)
+            ext_match = _FILENAME_WITH_EXT_RE.search(original)
             if ext_match:
                 path_str = ext_match.group(1)
 
         # Try to match with workspace files if we have a partial match
         path_str_lower = path_str.lower().strip()
-        workspace_lists = [
-            workspace.get("videos", []),
-            workspace.get("audios", []),
-            workspace.get("images", []),
-            workspace.get("subtitle_files", []),
-        ]
+        exact_match = name_index.get(path_str_lower)
+        if exact_match is not None:
+            return exact_match
 
-        for file_list in workspace_lists:
-            for ws_file in file_list:
-                ws_file_str = str(ws_file)
-                ws_filename = Path(ws_file_str).name.lower()
-                # Check if the cleaned path matches a workspace file
-                if path_str_lower == ws_filename or path_str_lower in ws_file_str.lower():
-                    return ws_file_str
+        for ws_file_lower, ws_file_str in path_index:
+            if path_str_lower in ws_file_lower:
+                return ws_file_str
 
         return path_str.strip()
 
     @staticmethod
     def repair_json_for_schema(
-        data: dict[str, Any] | None, user_query: str, workspace: dict[str, Any]
+        data: dict[str, Any] | None, user_query: str, workspace: dict[str, Any], *, in_place: bool = False
     ) -> dict[str, Any]:
-        """Repair JSON data by inferring missing required fields."""
+        """Repair JSON data by inferring missing required fields.
+
+        Args:
+            data: Parsed model response to repair.
+            user_query: Original user request, used to infer missing fields.
+            workspace: Workspace context, used to resolve file paths.
+            in_place: Mutate and return ``data`` itself instead of a shallow copy.
+                Only safe when the caller discards ``data`` afterwards.
+        """
         if data is None:
             data = {}
 
-        repaired = data.copy()
+        repaired = data if in_place else data.copy()
 
         # First, sanitize any path values that may have embedded text
         repaired = JSONRepair.sanitize_path_values(repaired, workspace)
@@ -204,11 +257,11 @@ class JSONRepair:
         response = JSONRepair.extract_json_from_text(response)
 
         # Fix null values for array fields that should be empty arrays
-        response = re.sub(r'"filters":\s*null', '"filters": []', response)
-        response = re.sub(r'"extra_flags":\s*null', '"extra_flags": []', response)
-        response = re.sub(r'"inputs":\s*null', '"inputs": []', response)
+        if "null" in response:
+            response = _NULL_ARRAY_RE.sub(r'"\1": []', response)
 
         # Fix missing array brackets for single values
         # Match patterns like "filters": "value" and convert to "filters": ["value"]
-        response = re.sub(r'"filters":\s*"([^"]+)"', r'"filters": ["\1"]', response)
-        return re.sub(r'"extra_flags":\s*"([^"]+)"', r'"extra_flags": ["\1"]', response)
+        if '"filters"' in response or '"extra_flags"' in response:
+            response = _SINGLE_TO_LIST_RE.sub(r'"\1": ["\2"]', response)
+        return response
@@ -155,7 +155,9 @@ class QueryParser:
         """Handle validation errors by attempting to repair JSON."""
         logger.debug(f"Schema validation failed, attempting to repair: {validation_err}")
         try:
-            repaired_data = self._json_repair.repair_json_for_schema(data, optimized_request, workspace)
+            repaired_data = self._json_repair.repair_json_for_schema(
+                data, optimized_request, workspace, in_place=True
+            )
             intent = MediaIntent.model_validate(repaired_data)
             logger.debug(f"Successfully repaired and parsed task: {intent.action}")
             return intent
@@ -235,7 +237,9 @@ class QueryParser:
         """Handle validation errors on retry attempt."""
         logger.debug(f"Retry validation failed, attempting to repair: {retry_validation_err}")
         try:
-            repaired_data2 = self._json_repair.repair_json_for_schema(data2, optimized_request, workspace)
+            repaired_data2 = self._json_repair.repair_json_for_schema(
+                data2, optimized_request, workspace, in_place=True
+            )
             intent2 = MediaIntent.model_validate(repaired_data2)
             logger.debug(f"Successfully repaired and parsed task on retry: {intent2.action}")
             return intent2
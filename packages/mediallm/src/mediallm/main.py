@@ -3,9 +3,55 @@
 
 import sys
 import traceback
+from importlib.util import find_spec
 
-try:
-    from mediallm.interface.terminal_interface import app as terminal_app
+# Flags answered before the CLI stack (rich, typer, pydantic, ollama) is imported
+_VERSION_FLAGS = ("--version", "-V")
+
+
+def terminal_app() -> None:
+    """Run the Typer application, importing the CLI stack on first use."""
+    from mediallm.interface.terminal_interface import app
+
+    app()
+
+
+def _print_version() -> None:
+    """Print the installed MediaLLM version without importing the CLI stack."""
+    from importlib.metadata import PackageNotFoundError
+    from importlib.metadata import version
+
+    try:
+        print(f"mediallm {version('mediallm')}")
+    except PackageNotFoundError:
+        from mediallm.utils.version import __version__
+
+        print(f"mediallm {__version__}")
+
+
+def main() -> None:
+    """Entry point for the mediallm CLI with error handling."""
+    # Only a lone version flag is answered early; anywhere else it may be part of a prompt or option value
+    if len(sys.argv) == 2 and sys.argv[1] in _VERSION_FLAGS:
+        _print_version()
+        return
+
+    _check_installation()
+    _run_cli()
+
+
+def _check_installation() -> None:
+    """Exit with a clear message if MediaLLM's own modules cannot be imported."""
+    try:
+        import mediallm.utils.exceptions  # noqa: F401
+    except ImportError as e:
+        print(f"Error: Failed to import MediaLLM components: {e}", file=sys.stderr)
+        print("Please ensure MediaLLM is properly installed.", file=sys.stderr)
+        sys.exit(1)
+
+
+def _run_cli() -> None:
+    """Validate the environment and run the CLI, mapping MediaLLM errors to exit codes."""
     from mediallm.utils.exceptions import ConfigError
     from mediallm.utils.exceptions import ConstructionError
     from mediallm.utils.exceptions import ExecError
@@ -13,14 +59,7 @@ try:
     from mediallm.utils.exceptions import SecurityError
     from mediallm.utils.exceptions import TranslationError
     from mediallm.utils.exceptions import ValidationError
-except ImportError as e:
-    print(f"Error: Failed to import MediaLLM components: {e}", file=sys.stderr)
-    print("Please ensure MediaLLM is properly installed.", file=sys.stderr)
-    sys.exit(1)
 
-
-def main() -> None:
-    """Entry point for the mediallm CLI with error handling."""
     try:
         # Basic environment validation
         _validate_environment()
@@ -87,16 +126,12 @@ def _check_required_modules() -> None:
         ("pydantic", "Pydantic data validation"),
     ]
 
-    missing_modules = []
-
-    def _try_import(name: str, desc: str) -> None:
-        try:
-            __import__(name)
-        except ImportError:
-            missing_modules.append(f"{name} ({desc})")
-
-    for module_name, description in required_modules:
-        _try_import(module_name, description)
+    # Only locate the modules; importing them here would pay their full init cost
+    missing_modules = [
+        f"{module_name} ({description})"
+        for module_name, description in required_modules
+        if find_spec(module_name) is None
+    ]
 
     if missing_modules:
         print("Error: Missing required dependencies:", file=sys.stderr)
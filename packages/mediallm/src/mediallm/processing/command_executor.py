@@ -3,60 +3,217 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import re
 import shutil
 import subprocess  # nosec B404: subprocess used with explicit list args, no shell
-import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import IO
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import Final
 
-from rich.console import Console
-from rich.panel import Panel
-
 from ..utils.exceptions import ExecError
-from ..utils.table_factory import TableFactory
 
+# Type-only imports; rich is imported on first use so that importing this module stays cheap
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from rich.console import Console
     from rich.table import Table
 
 logger = logging.getLogger(__name__)
 
 # Security constants for subprocess execution
 DEFAULT_SUBPROCESS_TIMEOUT: Final[int] = 300  # 5 minutes
-MAX_OUTPUT_SIZE: Final[int] = 10 * 1024 * 1024  # 10MB
+STDERR_TAIL_SIZE: Final[int] = 64 * 1024  # Trailing stderr kept for error reporting
+_STDERR_CHUNK_SIZE: Final[int] = 4096
+
+# On ASCII text RE2 agrees with Python's re except for \s, which lacks \v and \x1c-\x1f in RE2
+_RE2_ASCII_WHITESPACE: Final[str] = "[\t-\r\x1c-\x20]"
+
+
+def _drain_stderr_tail(stream: IO[bytes], tail: deque[bytes]) -> None:
+    """Read a stream to EOF, keeping only its most recent chunks in tail."""
+    for chunk in iter(lambda: stream.read1(_STDERR_CHUNK_SIZE), b""):
+        tail.append(chunk)
+
+
+def _compile_re2_pattern(source: str) -> Any:
+    """Compile a pattern for ASCII-only input with RE2, or return None if RE2 is not installed.
+
+    RE2 matches in linear time without backtracking, but its ``\\b`` and case folding
+    are ASCII-only, so the result must only be used on ASCII text.
+    """
+    try:
+        # Optional linear-time regex engine for the command security filter
+        import re2
+    except ImportError:
+        return None
+    return re2.compile(source.replace(r"\s", _RE2_ASCII_WHITESPACE))
+
+
+def _join_with_next_token(args: list[str], index: int) -> str:
+    """Space-join args[index] with the following arguments up to the first non-blank one.
+
+    Dangerous patterns continue across whitespace into at most one following token, so this
+    window sees every match that the whole space-joined command has at this boundary.
+    """
+    end = index + 1
+    while end < len(args) - 1 and not args[end].strip():
+        end += 1
+    return " ".join(args[index : end + 1])
+
+
+def _compile_validator(
+    valid_executables: set[str],
+    filter_flags: set[str],
+    load_dangerous_patterns: Callable[[], tuple[re.Pattern[str], Any, re.Pattern[str], re.Pattern[str]]],
+) -> Callable[[list[str]], bool]:
+    """Build a command security validator with its lookup tables bound as closure locals.
+
+    The validator runs once per command, so binding these up front avoids repeated
+    attribute lookups on the executor. load_dangerous_patterns returns the literal
+    prefilter, the RE2 pattern (or None), the re pattern and the argument-end pattern;
+    it is called on the first validation and their search methods are kept as locals.
+    """
+    prefilter_search: Callable[[str], object] | None = None
+    re2_search: Callable[[str], object] | None = None
+    pattern_search: Callable[[str], object] | None = None
+    arg_end_search: Callable[[str], object] | None = None
+
+    def matches_dangerous_pattern(text: str) -> bool:
+        # RE2's \b and case folding are ASCII-only, so it only scans ASCII text
+        if re2_search is not None and text.isascii():
+            return re2_search(text) is not None
+        return pattern_search(text) is not None
+
+    def validate(command: list[str]) -> bool:
+        nonlocal prefilter_search, re2_search, pattern_search, arg_end_search
+        if not command:
+            return False
+        # Compare the basename (POSIX or Windows separators) against the allowed set in O(1)
+        exe_name = command[0].rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+        if exe_name not in valid_executables and exe_name.removesuffix(".exe") not in valid_executables:
+            return False
+
+        if prefilter_search is None:
+            prefilter, re2_pattern, pattern, arg_end = load_dangerous_patterns()
+            re2_search = re2_pattern.search if re2_pattern is not None else None
+            pattern_search = pattern.search
+            arg_end_search = arg_end.search
+            prefilter_search = prefilter.search
+
+        # Separate filter arguments from other arguments
+        non_filter_args = []
+        skip_next = False
+        last_command_index = len(command) - 1
+        for i, arg in enumerate(command):
+            if skip_next:
+                skip_next = False
+                continue
+            if arg in filter_flags and i < last_command_index:
+                # Skip filter flag and its value (which may contain semicolons); a bare
+                # trailing filter flag is checked like any other argument
+                skip_next = True
+                continue
+            non_filter_args.append(arg)
+
+        # Check non-filter arguments for dangerous patterns and for semicolons outside of
+        # filter arguments (potential command injection) in a single pass
+        last_index = len(non_filter_args) - 1
+        for index, arg in enumerate(non_filter_args):
+            if ";" in arg:
+                return False
+            # casefold() maps every character the regex treats as case-equivalent onto the ASCII
+            # stems and leaves the metacharacters untouched, so one literal scan rules most args out
+            if prefilter_search(arg.casefold()) is None:
+                continue
+            if matches_dangerous_pattern(arg):
+                return False
+            # Only an argument ending in a keyword (or ">") can start a match that the next argument
+            # completes; scan that boundary as the space-joined command reads it
+            if (
+                index < last_index
+                and arg_end_search(arg) is not None
+                and matches_dangerous_pattern(_join_with_next_token(non_filter_args, index))
+            ):
+                return False
+
+        return True
+
+    return validate
 
 
 class CommandExecutor:
     """Handles FFmpeg command execution with security validation and progress tracking."""
 
-    _DANGEROUS_PATTERNS: Final[list[re.Pattern[str]]] = [
-        re.compile(r"\brm\s+-rf?\b", re.IGNORECASE),
-        re.compile(r"\brm\s+", re.IGNORECASE),
-        re.compile(r"\bdel\s+/[sfq]\b", re.IGNORECASE),
-        re.compile(r"\bdel\s+", re.IGNORECASE),
-        re.compile(r"\bformat\s+[a-z]:", re.IGNORECASE),
-        re.compile(r"\bsystem\s*\(", re.IGNORECASE),
-        re.compile(r"\bexec\s*\(", re.IGNORECASE),
-        re.compile(r"\beval\s*\(", re.IGNORECASE),
-        re.compile(r"[&|`]"),
-        re.compile(r"\$\("),
-        re.compile(r"\$\{"),
-        re.compile(r">\s*[/\\]"),
-        re.compile(r"\bsudo\b", re.IGNORECASE),
-        re.compile(r"\bchmod\b", re.IGNORECASE),
-        re.compile(r"\bchown\b", re.IGNORECASE),
-        re.compile(r"\bmkfs\b", re.IGNORECASE),
-        re.compile(r"\bdd\s+if=", re.IGNORECASE),
-    ]
+    # All dangerous patterns fused into one alternation so each command is scanned once.
+    # Keyword patterns are case-insensitive via inline (?i:...) groups; the rest stay case-sensitive.
+    _DANGEROUS_PATTERN_SOURCE: Final[str] = "|".join(
+        (
+            r"(?i:\brm\s+-rf?\b)",
+            r"(?i:\brm\s+)",
+            r"(?i:\bdel\s+/[sfq]\b)",
+            r"(?i:\bdel\s+)",
+            r"(?i:\bformat\s+[a-z]:)",
+            r"(?i:\bsystem\s*\()",
+            r"(?i:\bexec\s*\()",
+            r"(?i:\beval\s*\()",
+            r"[&|`]",
+            r"\$\(",
+            r"\$\{",
+            r">\s*[/\\]",
+            r"(?i:\bsudo\b)",
+            r"(?i:\bchmod\b)",
+            r"(?i:\bchown\b)",
+            r"(?i:\bmkfs\b)",
+            r"(?i:\bdd\s+if=)",
+        )
+    )
+    # Arguments ending in a keyword (or ">") that a following argument could complete into a
+    # dangerous pattern, e.g. ["rm", "-rf"]; only these are rescanned together with the next argument
+    _DANGEROUS_ARG_END_SOURCE: Final[str] = r"(?i:\b(?:rm|del|format|system|exec|eval|dd)\s*$)|>\s*$"
+    # Cheap prefilter: every dangerous-pattern match contains one of these keyword stems
+    # (after casefolding) or metacharacters, so commands without any of them skip the regex
+    _DANGEROUS_LITERALS: Final[tuple[str, ...]] = (
+        "rm",
+        "del",
+        "format",
+        "system",
+        "exec",
+        "eval",
+        "sudo",
+        "chmod",
+        "chown",
+        "mkfs",
+        "dd",
+    )
+    _DANGEROUS_METACHARS: Final[frozenset[str]] = frozenset("&|`$>")
     _FILTER_FLAGS: Final[set[str]] = {"-vf", "-af", "-filter_complex", "-filter:v", "-filter:a"}
     _VALID_EXECUTABLES: Final[set[str]] = {"ffmpeg", "ffprobe"}
-    _RENDER_DELAY: Final[float] = 0.5
+    # Resolved executable paths shared by all instances; misses are not cached so a later install is picked up
+    _WHICH_CACHE: Final[dict[str, str]] = {}
 
     def __init__(self, console: Console | None = None) -> None:
         """Initialize CommandExecutor."""
-        self.console = console or Console()
+        if console is None:
+            from rich.console import Console
+
+            console = Console()
+        self.console = console
+        # Keeps multi-line status output of concurrently running commands together
+        self._console_lock = threading.Lock()
+        self._validator = _compile_validator(
+            self._VALID_EXECUTABLES,
+            self._FILTER_FLAGS,
+            self._dangerous_patterns,
+        )
 
     @classmethod
     def format_command(cls, cmd: list[str]) -> str:
@@ -70,19 +227,21 @@ class CommandExecutor:
             return None
         return Path(cmd[-1])
 
-    @classmethod
-    def check_overwrite_protection(cls, _commands: list[list[str]], _assume_yes: bool = False) -> bool:
-        """Check for existing output files."""
-        return True
-
     @classmethod
     def detect_overwrites(cls, commands: list[list[str]]) -> bool:
         """Detect if any output files would be overwritten."""
-        return any(cls.extract_output_path(cmd) and cls.extract_output_path(cmd).exists() for cmd in commands)
+        # Stat each distinct output path once; lexists avoids following symlinks
+        output_paths = {cmd[-1] for cmd in commands if len(cmd) >= 2}
+        return any(os.path.lexists(path) for path in output_paths)
 
     def preview(self, commands: list[list[str]]) -> None:
-        """Display a preview of planned ffmpeg commands."""
-        logger.debug(f"Previewing {len(commands)} commands")
+        """Display a preview of planned ffmpeg commands.
+
+        Nothing is built when the console is quiet, since its output would be discarded.
+        """
+        logger.debug("Previewing %d commands", len(commands))
+        if self.console.quiet:
+            return
         if not commands:
             self.console.print("[bold green]⚠️ No commands to preview[/bold green]")
             return
@@ -93,7 +252,7 @@ class CommandExecutor:
 
     def preview_modified_commands(self, original_commands: list[list[str]], modified_commands: list[list[str]]) -> None:
         """Display modified commands table showing changes made for overwrite handling."""
-        if not modified_commands:
+        if not modified_commands or self.console.quiet:
             return
 
         table = self._create_modified_commands_table()
@@ -108,9 +267,21 @@ class CommandExecutor:
         show_preview: bool = True,
         assume_yes: bool = False,
         output_dir: Path | None = None,
+        concurrency: int = 1,
     ) -> int:
-        """Execute ffmpeg commands with validation and error handling."""
-        logger.debug(f"Starting execution run: {len(commands)} commands, dry_run={dry_run}, confirm={confirm}")
+        """Execute ffmpeg commands with validation and error handling.
+
+        Commands run one at a time by default. With concurrency > 1, up to that many
+        independent commands run at once (capped by the CPU count); only use this when
+        no command consumes another command's output.
+        """
+        logger.debug(
+            "Starting execution run: %d commands, dry_run=%s, confirm=%s, assume_yes=%s",
+            len(commands),
+            dry_run,
+            confirm,
+            assume_yes,
+        )
         if not commands:
             logger.debug("No commands to execute")
             self.console.print("[bold green]⚠️ No commands to execute[/bold green]")
@@ -129,10 +300,12 @@ class CommandExecutor:
             self.console.print("[bold green]Execution cancelled by user[/bold green]")
             return 0
 
-        return self._execute_commands(commands, assume_yes, output_dir)
+        return self._execute_commands(commands, output_dir, concurrency)
 
     def _create_preview_table(self) -> Table:
         """Create preview table for commands."""
+        from ..utils.table_factory import TableFactory
+
         table = TableFactory.create_command_table("Planned ffmpeg Commands")
         table.add_column("#", style="bold cyan", justify="center")
         table.add_column("Command", style="white", overflow="fold")
@@ -142,14 +315,22 @@ class CommandExecutor:
 
     def _populate_preview_table(self, table: Table, commands: list[list[str]]) -> None:
         """Populate preview table with command information."""
+        exists_cache: dict[str, bool] = {}
         for idx, cmd in enumerate(commands, start=1):
-            output_path = self.extract_output_path(cmd)
-            output_display = str(output_path) if output_path else "N/A"
-            status = "New" if not output_path or not output_path.exists() else "Overwrite"
-            table.add_row(str(idx), self.format_command(cmd), output_display, status)
+            # The output is the last argument (see extract_output_path); use the string directly
+            if len(cmd) < 2:
+                table.add_row(str(idx), self.format_command(cmd), "N/A", "New")
+                continue
+            output_str = cmd[-1]
+            exists = exists_cache.get(output_str)
+            if exists is None:
+                exists = exists_cache[output_str] = os.path.lexists(output_str)
+            table.add_row(str(idx), self.format_command(cmd), output_str, "Overwrite" if exists else "New")
 
     def _create_modified_commands_table(self) -> Table:
         """Create modified commands table."""
+        from ..utils.table_factory import TableFactory
+
         table = TableFactory.create_command_table("Modified Commands for Execution")
         table.add_column("#", style="bold cyan", justify="center")
         table.add_column("Command", style="white", overflow="fold")
@@ -192,41 +373,72 @@ class CommandExecutor:
         self.console.print("\n")
         self.console.print(table)
         self.console.file.flush()
-        time.sleep(self._RENDER_DELAY)
 
-    def _execute_commands(self, commands: list[list[str]], assume_yes: bool, output_dir: Path | None) -> int:
+    def _execute_commands(self, commands: list[list[str]], output_dir: Path | None, concurrency: int = 1) -> int:
         """Execute all commands with progress tracking."""
-        logger.debug(f"Executing {len(commands)} commands with overwrite protection check")
-        if not self.check_overwrite_protection(commands, assume_yes):
-            logger.debug("Operation cancelled by user due to file conflicts")
-            self.console.print("[bold green]Operation cancelled due to file conflicts[/bold green]")
-            return 1
-
         total_commands = len(commands)
         successful_commands = 0
-        logger.debug(f"Starting batch execution of {total_commands} commands")
+        logger.debug("Starting batch execution of %d commands", total_commands)
 
         self.console.print(f"\n[bold green]Starting execution of {total_commands} command(s)...[/bold green]")
         self.console.print()
 
-        for i, cmd in enumerate(commands, 1):
-            logger.debug(f"Executing command {i}/{total_commands}: {' '.join(cmd[:3])}...")
-            try:
-                self._execute_single_command(cmd, i, total_commands)
-                successful_commands += 1
-                logger.debug(f"Command {i} completed successfully")
-            except ExecError as e:
-                logger.error(f"Command {i} failed: {str(e)[:100]}...")
-                self.console.print(f"[red]Command {i} failed:[/red] {e}")
-                raise
+        max_workers = min(concurrency, total_commands, os.cpu_count() or 1)
+        if max_workers > 1:
+            successful_commands = self._execute_commands_concurrently(commands, max_workers)
+        else:
+            for i, cmd in enumerate(commands, 1):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Executing command %d/%d: %s...", i, total_commands, " ".join(cmd[:3]))
+                try:
+                    self._execute_single_command(cmd, i, total_commands)
+                    successful_commands += 1
+                    logger.debug("Command %d completed successfully", i)
+                except ExecError as e:
+                    logger.error("Command %d failed: %.100s...", i, e)
+                    self.console.print(f"[red]Command {i} failed:[/red] {e}")
+                    raise
 
         self._display_execution_summary(successful_commands, total_commands, output_dir)
         final_result = 0 if successful_commands == total_commands else 1
         logger.debug(
-            f"Batch execution completed: {successful_commands}/{total_commands} successful, exit code: {final_result}"
+            "Batch execution completed: %d/%d successful, exit code: %d",
+            successful_commands,
+            total_commands,
+            final_result,
         )
         return final_result
 
+    def _execute_commands_concurrently(self, commands: list[list[str]], max_workers: int) -> int:
+        """Execute independent commands on a bounded thread pool.
+
+        Each ffmpeg process runs outside the GIL, so threads are enough to keep
+        several of them busy. On the first failure, pending commands are cancelled
+        and the error is re-raised once running commands finish.
+        """
+        total_commands = len(commands)
+        successful_commands = 0
+        logger.debug("Running %d commands with %d workers", total_commands, max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._execute_single_command, cmd, i, total_commands)
+                for i, cmd in enumerate(commands, 1)
+            ]
+            i = 0
+            try:
+                for i, future in enumerate(futures, 1):
+                    future.result()
+                    successful_commands += 1
+                    logger.debug("Command %d completed successfully", i)
+            except ExecError as e:
+                for pending in futures:
+                    pending.cancel()
+                logger.error("Command %d failed: %.100s...", i, e)
+                with self._console_lock:
+                    self.console.print(f"[red]Command {i} failed:[/red] {e}")
+                raise
+        return successful_commands
+
     def _execute_single_command(
         self, cmd: list[str], cmd_num: int, total_cmds: int, timeout: int | None = None
     ) -> None:
@@ -238,42 +450,30 @@ class CommandExecutor:
             total_cmds: Total number of commands in the batch.
             timeout: Timeout in seconds (defaults to DEFAULT_SUBPROCESS_TIMEOUT).
         """
-        logger.debug(f"Validating command {cmd_num}: {' '.join(cmd)}")
-        self._validate_command(cmd)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validating command %d: %s", cmd_num, " ".join(cmd))
+        executable = self._validate_command(cmd)
 
         effective_timeout = timeout or DEFAULT_SUBPROCESS_TIMEOUT
         output_path = self.extract_output_path(cmd)
-        logger.debug(f"Command {cmd_num} output path: {output_path}")
-        self.console.print(f"[bold blue]Executing command {cmd_num}/{total_cmds}:[/bold blue]")
-        self.console.print(f"[dim]Output:[/dim] {output_path}")
+        logger.debug("Command %d output path: %s", cmd_num, output_path)
+        with self._console_lock:
+            self.console.print(f"[bold blue]Executing command {cmd_num}/{total_cmds}:[/bold blue]")
+            self.console.print(f"[dim]Output:[/dim] {output_path}")
 
         try:
-            logger.debug(f"Starting subprocess execution for command {cmd_num} (timeout={effective_timeout}s)")
-            # nosec B603: fixed binary, no shell, args vetted
-            result = subprocess.run(
-                cmd,
-                check=True,
-                timeout=effective_timeout,
-                capture_output=True,
-            )
-            logger.debug(f"Subprocess completed for command {cmd_num} with return code: {result.returncode}")
-
-            # Check output size limits
-            if result.stdout and len(result.stdout) > MAX_OUTPUT_SIZE:
-                logger.warning(f"Command {cmd_num} output exceeds size limit, truncating logs")
-
-            if result.returncode != 0:
-                raise ExecError(
-                    f"ffmpeg command failed with exit code {result.returncode}. "
-                    f"Common causes: (1) input file not found or corrupted, "
-                    f"(2) invalid output format or codec, "
-                    f"(3) insufficient disk space, "
-                    f"(4) permission issues. Check file paths and try again."
-                )
-            self.console.print(f"[green]Command {cmd_num} completed successfully[/green]")
+            logger.debug("Starting subprocess execution for command %d (timeout=%ss)", cmd_num, effective_timeout)
+            # Run the resolved executable directly so the child does not search PATH again
+            returncode, stderr_tail = self._run_streaming([executable, *cmd[1:]], effective_timeout)
+            logger.debug("Subprocess completed for command %d with return code: %d", cmd_num, returncode)
+
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr_tail)
+            with self._console_lock:
+                self.console.print(f"[green]Command {cmd_num} completed successfully[/green]")
 
         except subprocess.TimeoutExpired as exc:
-            logger.error(f"Command {cmd_num} timed out after {effective_timeout}s")
+            logger.error("Command %d timed out after %ss", cmd_num, effective_timeout)
             raise ExecError(
                 f"FFmpeg command timed out after {effective_timeout} seconds. "
                 f"This may be due to: (1) very large input file, "
@@ -282,12 +482,13 @@ class CommandExecutor:
                 f"Try increasing the timeout or processing smaller files."
             ) from exc
         except subprocess.CalledProcessError as exc:
-            logger.error(f"ffmpeg execution failed for command {cmd_num}: {exc}")
-            logger.debug(f"Failed command details: {' '.join(cmd)}")
-            stderr_msg = exc.stderr.decode() if exc.stderr else ""
+            logger.error("ffmpeg execution failed for command %d: %s", cmd_num, exc)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Failed command details: %s", " ".join(cmd))
+            stderr_msg = exc.stderr.decode(errors="replace") if exc.stderr else ""
             raise ExecError(
                 f"ffmpeg execution failed with error: {exc}. "
-                f"{f'Details: {stderr_msg[:500]}' if stderr_msg else ''}"
+                f"{f'Details: {stderr_msg[-500:]}' if stderr_msg else ''}"
                 f"Please verify: (1) input files exist and are readable, "
                 f"(2) output directory is writable, "
                 f"(3) ffmpeg is properly installed (try 'ffmpeg -version'), "
@@ -295,36 +496,76 @@ class CommandExecutor:
                 f"Use --verbose for detailed logging."
             ) from exc
 
-    def _validate_command(self, cmd: list[str]) -> None:
-        """Validate command for execution."""
-        logger.debug(f"Validating command: {cmd[0] if cmd else 'empty'}")
+    @staticmethod
+    def _run_streaming(cmd: list[str], timeout: int) -> tuple[int, bytes]:
+        """Run a command, discarding stdout and keeping only the tail of stderr.
+
+        Stderr is drained on a background thread so ffmpeg never blocks on a full
+        pipe, while memory stays bounded by STDERR_TAIL_SIZE.
+
+        Returns:
+            The exit code and the trailing stderr output.
+
+        Raises:
+            subprocess.TimeoutExpired: If the command does not finish within timeout.
+        """
+        tail: deque[bytes] = deque(maxlen=STDERR_TAIL_SIZE // _STDERR_CHUNK_SIZE)
+        # nosec B603: fixed binary, no shell, args vetted
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        drainer = threading.Thread(target=_drain_stderr_tail, args=(proc.stderr, tail), daemon=True)
+        drainer.start()
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            drainer.join()
+            if proc.stderr:
+                proc.stderr.close()
+        return returncode, b"".join(tail)
+
+    def _validate_command(self, cmd: list[str]) -> str:
+        """Validate command for execution.
+
+        Returns:
+            Absolute path of the command's executable.
+        """
+        logger.debug("Validating command: %s", cmd[0] if cmd else "empty")
         if not cmd:
             logger.error("Empty command received for validation")
             raise ExecError("Empty command received for execution.")
 
-        self._validate_executable_exists(cmd[0])
+        resolved = self._validate_executable_exists(cmd[0])
         self._validate_command_security(cmd)
         logger.debug("Command validation passed")
+        return resolved
 
-    def _validate_executable_exists(self, executable: str) -> None:
-        """Validate that the executable exists in PATH."""
-        logger.debug(f"Checking if executable exists: {executable}")
-        resolved = shutil.which(executable)
+    def _validate_executable_exists(self, executable: str) -> str:
+        """Validate that the executable exists in PATH and return its absolute path."""
+        logger.debug("Checking if executable exists: %s", executable)
+        resolved = self._WHICH_CACHE.get(executable)
         if resolved is None:
-            logger.error(f"Executable not found in PATH: {executable}")
+            resolved = shutil.which(executable)
+            if resolved is not None:
+                self._WHICH_CACHE[executable] = resolved
+        if resolved is None:
+            logger.error("Executable not found in PATH: %s", executable)
             raise ExecError(
                 f"Executable not found: {executable}. Please install FFmpeg:\n"
                 "• macOS: brew install ffmpeg\n"
                 "• Ubuntu/Debian: sudo apt install ffmpeg\n"
                 "• Windows: choco install ffmpeg"
             )
-        logger.debug(f"Executable found: {resolved}")
+        logger.debug("Executable found: %s", resolved)
+        return resolved
 
     def _validate_command_security(self, cmd: list[str]) -> None:
         """Validate command for basic security."""
         logger.debug("Performing security validation on command")
-        if not self._is_command_secure(cmd):
-            logger.error(f"Command failed security validation: {' '.join(cmd[:3])}...")
+        if not self._validator(cmd):
+            logger.error("Command failed security validation: %s...", " ".join(cmd[:3]))
             raise ExecError(
                 "Command failed security validation. This could be due to: (1) unsafe file paths or arguments, (2) "
                 "unsupported ffmpeg flags, or (3) potential security risks. Please check your input and try a simpler "
@@ -340,37 +581,49 @@ class CommandExecutor:
         Special handling for FFmpeg filter arguments which legitimately use
         semicolons in complex filtergraph syntax.
         """
-        if not command or not any(command[0].endswith(exe) for exe in self._VALID_EXECUTABLES):
-            return False
+        return self._validator(command)
 
-        # Separate filter arguments from other arguments
-        non_filter_args = []
-        i = 0
-        while i < len(command):
-            arg = command[i]
-            if arg in self._FILTER_FLAGS and i + 1 < len(command):
-                # Skip filter flag and its value (which may contain semicolons)
-                i += 2
-            else:
-                non_filter_args.append(arg)
-                i += 1
-
-        # Check non-filter arguments for dangerous patterns
-        cmd_str = " ".join(non_filter_args)
-        if any(pattern.search(cmd_str) for pattern in self._DANGEROUS_PATTERNS):
-            return False
+    @classmethod
+    @functools.cache
+    def _dangerous_pattern(cls) -> re.Pattern[str]:
+        """Compile the fused dangerous-pattern alternation on first use."""
+        return re.compile(cls._DANGEROUS_PATTERN_SOURCE)
 
-        # Check for semicolons outside of filter arguments (potential command injection)
-        for arg in non_filter_args:
-            if ";" in arg:
-                return False
+    @classmethod
+    @functools.cache
+    def _dangerous_pattern_re2(cls) -> Any:
+        """Compile the fused dangerous-pattern alternation with RE2 on first use (None without RE2)."""
+        return _compile_re2_pattern(cls._DANGEROUS_PATTERN_SOURCE)
 
-        return True
+    @classmethod
+    @functools.cache
+    def _dangerous_arg_end(cls) -> re.Pattern[str]:
+        """Compile the dangerous argument-ending pattern on first use."""
+        return re.compile(cls._DANGEROUS_ARG_END_SOURCE)
+
+    @classmethod
+    @functools.cache
+    def _dangerous_prefilter(cls) -> re.Pattern[str]:
+        """Compile the keyword stems and metacharacters into one literal alternation on first use."""
+        metachars = "".join(sorted(cls._DANGEROUS_METACHARS))
+        return re.compile("|".join(map(re.escape, cls._DANGEROUS_LITERALS)) + f"|[{re.escape(metachars)}]")
+
+    @classmethod
+    def _dangerous_patterns(cls) -> tuple[re.Pattern[str], Any, re.Pattern[str], re.Pattern[str]]:
+        """Return the literal prefilter, RE2 (or None), re and argument-end patterns, compiled on first use."""
+        return (
+            cls._dangerous_prefilter(),
+            cls._dangerous_pattern_re2(),
+            cls._dangerous_pattern(),
+            cls._dangerous_arg_end(),
+        )
 
     def _display_execution_summary(
         self, successful_commands: int, total_commands: int, output_dir: Path | None
     ) -> None:
         """Display execution summary."""
+        from rich.panel import Panel
+
         self.console.print()
 
         if successful_commands == total_commands:
@@ -407,7 +660,10 @@ class CommandExecutor:
 
 
 # Module-level convenience functions for backward compatibility
-_executor = CommandExecutor()
+@functools.cache
+def _get_executor() -> CommandExecutor:
+    """Return the shared executor, creating it (and its console) on first use."""
+    return CommandExecutor()
 
 
 def format_command(cmd: list[str]) -> str:
@@ -420,11 +676,6 @@ def extract_output_path(cmd: list[str]) -> Path | None:
     return CommandExecutor.extract_output_path(cmd)
 
 
-def check_overwrite_protection(commands: list[list[str]], assume_yes: bool = False) -> bool:
-    """Check for existing output files."""
-    return CommandExecutor.check_overwrite_protection(commands, assume_yes)
-
-
 def detect_overwrites(commands: list[list[str]]) -> bool:
     """Detect if any output files would be overwritten."""
     return CommandExecutor.detect_overwrites(commands)
@@ -432,12 +683,12 @@ def detect_overwrites(commands: list[list[str]]) -> bool:
 
 def preview(commands: list[list[str]]) -> None:
     """Display a preview of planned ffmpeg commands."""
-    _executor.preview(commands)
+    _get_executor().preview(commands)
 
 
 def preview_modified_commands(original_commands: list[list[str]], modified_commands: list[list[str]]) -> None:
     """Display modified commands table showing changes made for overwrite handling."""
-    _executor.preview_modified_commands(original_commands, modified_commands)
+    _get_executor().preview_modified_commands(original_commands, modified_commands)
 
 
 def run(
@@ -447,6 +698,7 @@ def run(
     show_preview: bool = True,
     assume_yes: bool = False,
     output_dir: Path | None = None,
+    concurrency: int = 1,
 ) -> int:
     """Execute ffmpeg commands with validation and error handling."""
-    return _executor.run(commands, confirm, dry_run, show_preview, assume_yes, output_dir)
+    return _get_executor().run(commands, confirm, dry_run, show_preview, assume_yes, output_dir, concurrency)
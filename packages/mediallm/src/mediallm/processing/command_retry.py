@@ -5,8 +5,15 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import itertools
 import logging
+import os
+import re
+import shutil
 import subprocess  # nosec B404: subprocess used with explicit list args, no shell
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
@@ -29,6 +36,192 @@ logger = create_secure_logger(__name__)
 # Constants
 MAX_RETRY_ATTEMPTS: Final[int] = 3
 FFMPEG_VALIDATION_TIMEOUT: Final[int] = 10  # seconds
+VALIDATION_CACHE_SIZE: Final[int] = 256  # Validated commands remembered across retry attempts
+MAX_VALIDATION_WORKERS: Final[int] = 8  # Upper bound on concurrent ffmpeg validation processes
+
+# Known FFmpeg error phrases; a line is relevant if it contains one of them or the word "error"
+_ERROR_PATTERNS: Final[tuple[str, ...]] = (
+    "Invalid data found",
+    "Unknown encoder",
+    "Unknown decoder",
+    "Encoder not found",
+    "Decoder not found",
+    "No such file or directory",
+    "Permission denied",
+    "Invalid argument",
+    "Unrecognized option",
+    "does not support",
+    "codec not currently supported",
+    "Invalid option",
+    "Error while opening",
+    "Output file",
+    "cannot be used together",
+    "error",
+)
+_ERROR_LINE_RE: Final[re.Pattern[str]] = re.compile("|".join(map(re.escape, _ERROR_PATTERNS)), re.IGNORECASE)
+
+# Input arguments that are not local files: pipes, remote URLs and stray flags
+_NON_FILE_INPUT_PREFIXES: Final[tuple[str, ...]] = ("pipe:", "http://", "https://", "-")
+
+# First non-blank stderr line not starting with "[" (ffmpeg component logs), without surrounding whitespace
+_FIRST_ERROR_LINE_RE: Final[re.Pattern[bytes]] = re.compile(
+    rb"^[ \t\r\f\v]*([^\s\[][^\n]*?)[ \t\r\f\v]*$", re.MULTILINE
+)
+
+_FFMPEG_NOT_FOUND_MESSAGE: Final[str] = "FFmpeg executable not found. Please install FFmpeg."
+
+# Number of relevant error lines forwarded to the LLM on retry
+MAX_ERROR_SUMMARY_LINES: Final[int] = 3
+
+# Retry notice shown when execution fails; only the error and attempt number vary
+_RETRY_PANEL_TEMPLATE: Final[str] = (
+    "[yellow]Execution failed: {error}...[/yellow]\n\n"
+    "Attempting to regenerate command (attempt {attempt}/{total})..."
+)
+_RETRY_PANEL_TITLE: Final[str] = "[bold yellow]Retry[/bold yellow]"
+
+
+@functools.cache
+def _error_pattern_db() -> Any:
+    """Compile the error phrases into a Hyperscan database, or return None if unavailable."""
+    try:
+        # Optional multi-pattern matcher used to pick relevant lines out of large error messages
+        import hyperscan
+    except ImportError:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(p).encode() for p in _ERROR_PATTERNS],
+            ids=list(range(len(_ERROR_PATTERNS))),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(_ERROR_PATTERNS),
+        )
+    except hyperscan.error as e:
+        logger.debug(f"Hyperscan database compilation failed; using re: {e}")
+        return None
+    return db
+
+
+def _hyperscan_error_lines(db: Any, message: bytes) -> list[str]:
+    """Return up to MAX_ERROR_SUMMARY_LINES stripped lines of message containing an error phrase.
+
+    The whole message is scanned in one pass; matches arrive ordered by end
+    offset, so lines are collected in order and the scan stops once enough
+    lines were found.
+    """
+    import hyperscan
+
+    line_starts: list[int] = []
+
+    def on_match(_id: int, _start: int, end: int, _flags: int, _context: Any) -> bool:
+        line_start = message.rfind(b"\n", 0, end) + 1
+        if not line_starts or line_starts[-1] != line_start:
+            line_starts.append(line_start)
+        return len(line_starts) >= MAX_ERROR_SUMMARY_LINES
+
+    # Returning True from on_match stops the scan early, which hyperscan reports as ScanTerminated
+    with contextlib.suppress(hyperscan.ScanTerminated):
+        db.scan(message, match_event_handler=on_match)
+
+    lines = []
+    for line_start in line_starts:
+        line_end = message.find(b"\n", line_start)
+        lines.append(message[line_start : line_end if line_end >= 0 else len(message)].strip().decode("ascii"))
+    return lines
+
+
+# Flags whose values name an encoder or a filtergraph, checked by the in-process PyAV pre-check
+_PYAV_CODEC_FLAGS: Final[frozenset[str]] = frozenset(
+    {"-c", "-codec", "-c:v", "-c:a", "-c:s", "-codec:v", "-codec:a", "-codec:s", "-vcodec", "-acodec", "-scodec"}
+)
+_PYAV_FILTER_FLAGS: Final[frozenset[str]] = frozenset({"-vf", "-af", "-filter:v", "-filter:a", "-filter_complex"})
+_FILTER_NAME_RE: Final[re.Pattern[str]] = re.compile(r"^\s*(?:\[[^\]]*\]\s*)*([A-Za-z0-9_]+)")
+
+# Optional in-process pre-check with PyAV (opt-in via MEDIALLM_USE_PYAV=1). It can only reject a
+# command early; every command it does not reject is still checked by running ffmpeg.
+av: Any = None
+if os.getenv("MEDIALLM_USE_PYAV", "").lower() in {"1", "true", "yes"}:
+    try:
+        import av
+        import av.filter
+    except ImportError:
+        logger.debug("MEDIALLM_USE_PYAV is set but PyAV is not installed; validating with ffmpeg")
+        av = None
+
+
+@functools.cache
+def _pyav_has_encoder(name: str) -> bool:
+    """Return True if PyAV's libav build provides an encoder with this name."""
+    try:
+        av.codec.Codec(name, "w")
+    except Exception:
+        return False
+    return True
+
+
+def _split_filtergraph(graph: str) -> list[str] | None:
+    """Split a filtergraph at top-level "," and ";", or return None if its quoting is unbalanced.
+
+    Separators inside '...' quotes or escaped with a backslash belong to filter arguments.
+    """
+    items = []
+    start = 0
+    quoted = escaped = False
+    for i, char in enumerate(graph):
+        if escaped:
+            escaped = False
+        elif char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "\\":
+            escaped = True
+        elif char in ",;":
+            items.append(graph[start:i])
+            start = i + 1
+    if quoted or escaped:
+        return None
+    items.append(graph[start:])
+    return items
+
+
+def _pyav_unknown_filter(graph: str) -> str | None:
+    """Return the first filter named in a filtergraph that PyAV's libav build lacks, if any.
+
+    A filtergraph that cannot be split confidently is left to ffmpeg.
+    """
+    for chain_item in _split_filtergraph(graph) or ():
+        match = _FILTER_NAME_RE.match(chain_item)
+        if match and match.group(1) not in av.filter.filters_available:
+            return match.group(1)
+    return None
+
+
+def _pyav_rejection(cmd: list[str]) -> str | None:
+    """Return why PyAV rejects an ffmpeg command, or None to pass it on to ffmpeg validation.
+
+    Only encoder and filter names are checked, not filter arguments, other options or
+    container/codec compatibility. A None result is therefore not an acceptance: the
+    command must still go through the ffmpeg quick check, which this never replaces.
+    Codec flags before the last input select decoders and are left to ffmpeg.
+    """
+    last_input = max((i for i, arg in enumerate(cmd) if arg == "-i"), default=0)
+    for i, (flag, value) in enumerate(itertools.pairwise(cmd)):
+        if flag in _PYAV_CODEC_FLAGS and i > last_input and value != "copy" and not _pyav_has_encoder(value):
+            return f"Unknown encoder '{value}'"
+        if flag in _PYAV_FILTER_FLAGS:
+            unknown_filter = _pyav_unknown_filter(value)
+            if unknown_filter is not None:
+                return f"No such filter: '{unknown_filter}'"
+    return None
+
+
+def _mtime_ns(path: str) -> int | None:
+    """Return a file's modification time in nanoseconds, or None if it cannot be read."""
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
 
 
 class CommandRetryHandler:
@@ -38,83 +231,154 @@ class CommandRetryHandler:
         """Initialize the retry handler."""
         self._llm = llm
         self._console = console or Console()
+        # Resolved once per handler so a missing ffmpeg is reported without an exec attempt per command
+        self._ffmpeg_path = shutil.which("ffmpeg")
 
     def validate_ffmpeg_command(self, cmd: list[str]) -> tuple[bool, str]:
-        """Validate an FFmpeg command by performing a dry-run check."""
+        """Validate an FFmpeg command by performing a dry-run check.
+
+        Results are cached per command and input file modification times, so an
+        unchanged command is not probed again on later retry attempts.
+        """
         if not cmd or cmd[0] not in ("ffmpeg", "ffprobe"):
             return False, "Command must start with ffmpeg or ffprobe"
+        if cmd[0] == "ffmpeg" and self._ffmpeg_path is None:
+            return False, _FFMPEG_NOT_FOUND_MESSAGE
 
-        validation_cmd = cmd.copy()
-        if "-v" not in validation_cmd:
-            validation_cmd.insert(1, "-v")
-            validation_cmd.insert(2, "error")
-
-        input_check_errors = self._check_input_files(cmd)
-        if input_check_errors:
-            return False, input_check_errors
-
+        # Only results of a finished check are cached; a timeout or an unexpected failure
+        # is raised through the cache and handled here, so a later attempt probes again
         try:
-            quick_check_cmd = self._build_quick_validation_cmd(cmd)
-            if quick_check_cmd:
-                result = subprocess.run(  # nosec B603
-                    quick_check_cmd,
-                    capture_output=True,
-                    timeout=FFMPEG_VALIDATION_TIMEOUT,
-                )
-                if result.returncode != 0:
-                    stderr = result.stderr.decode("utf-8", errors="replace")
-                    error_lines = [
-                        line for line in stderr.split("\n")
-                        if line.strip() and not line.startswith("[")
-                    ]
-                    error_msg = error_lines[0] if error_lines else stderr[:200]
-                    return False, f"FFmpeg validation failed: {error_msg}"
-
+            return self._validate_cached(tuple(cmd), self._input_file_stamps(cmd), self._ffmpeg_path)
         except subprocess.TimeoutExpired:
             logger.debug("Validation timed out - proceeding with command")
             return True, ""
         except FileNotFoundError:
-            return False, "FFmpeg executable not found. Please install FFmpeg."
+            return False, _FFMPEG_NOT_FOUND_MESSAGE
         except Exception as e:
             logger.debug(f"Validation check failed with exception: {e}")
             return True, ""
 
+    @staticmethod
+    def _input_file_stamps(cmd: list[str]) -> tuple[tuple[str, int | None], ...]:
+        """Return (path, mtime_ns) for each local input file; mtime is None if it is missing."""
+        return tuple((input_path, _mtime_ns(input_path)) for input_path in CommandRetryHandler._local_input_paths(cmd))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+    def _validate_cached(
+        cmd_key: tuple[str, ...], _input_stamps: tuple[tuple[str, int | None], ...], ffmpeg_path: str | None
+    ) -> tuple[bool, str]:
+        """Validate a command; input stamps are part of the cache key only.
+
+        Raises:
+            subprocess.TimeoutExpired: If the quick ffmpeg check does not finish in time.
+        """
+        cmd = list(cmd_key)
+
+        input_check_errors = CommandRetryHandler._check_input_files(cmd)
+        if input_check_errors:
+            return False, input_check_errors
+
+        # PyAV may reject a command before ffmpeg is spawned, but never accepts one on its own
+        pyav_rejection = _pyav_rejection(cmd) if av is not None and cmd[0] == "ffmpeg" else None
+        if pyav_rejection is not None:
+            return False, f"FFmpeg validation failed: {pyav_rejection}"
+
+        quick_check_cmd = CommandRetryHandler._build_quick_validation_cmd(cmd)
+        if quick_check_cmd:
+            # Only stderr is inspected; anything written to stdout is discarded unbuffered
+            result = subprocess.run(  # nosec B603
+                [ffmpeg_path or quick_check_cmd[0], *quick_check_cmd[1:]],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=FFMPEG_VALIDATION_TIMEOUT,
+            )
+            if result.returncode != 0:
+                error_msg = CommandRetryHandler._first_error_line(result.stderr)
+                return False, f"FFmpeg validation failed: {error_msg}"
+
         return True, ""
 
-    def _check_input_files(self, cmd: list[str]) -> str:
+    @staticmethod
+    def _first_error_line(stderr: bytes) -> str:
+        """Decode only the first stderr line that is not a bracketed component log."""
+        match = _FIRST_ERROR_LINE_RE.search(stderr)
+        if match:
+            return match.group(1).decode("utf-8", errors="replace")
+        return stderr[:200].decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _local_input_paths(cmd: list[str]) -> list[str]:
+        """Return the local file paths passed to -i (pipes, URLs and stdin are skipped)."""
+        input_paths = []
+        start = 0
+        # Jump between -i occurrences with list.index instead of inspecting every token
+        while True:
+            try:
+                i = cmd.index("-i", start)
+            except ValueError:
+                break
+            if i + 1 >= len(cmd):
+                break
+            input_path = cmd[i + 1]
+            if not input_path.startswith(_NON_FILE_INPUT_PREFIXES):
+                input_paths.append(input_path)
+            start = i + 2
+        return input_paths
+
+    @staticmethod
+    def _missing_paths(paths: list[str]) -> list[str]:
+        """Return the paths that do not exist, listing each shared directory only once.
+
+        Inputs that share a directory (e.g. concat sources) are looked up in a single
+        scandir listing instead of one stat per file. Names not found in the listing,
+        symlinks, and directories that cannot be listed fall back to Path.exists.
+        """
+        by_dir: dict[str, list[str]] = {}
+        for path in paths:
+            by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+        missing = set()
+        for directory, dir_paths in by_dir.items():
+            listed: set[str] = set()
+            if len(dir_paths) > 1:
+                try:
+                    with os.scandir(directory or ".") as it:
+                        listed = {entry.name for entry in it if not entry.is_symlink()}
+                except OSError:
+                    pass
+            missing.update(
+                path for path in dir_paths if os.path.basename(path) not in listed and not Path(path).exists()
+            )
+        return [path for path in paths if path in missing]
+
+    @staticmethod
+    def _check_input_files(cmd: list[str]) -> str:
         """Check if input files specified in the command exist."""
-        missing_files = []
-        i = 0
-        while i < len(cmd):
-            if cmd[i] == "-i" and i + 1 < len(cmd):
-                input_path = cmd[i + 1]
-                if not input_path.startswith(("pipe:", "http://", "https://", "-")):
-                    if not Path(input_path).exists():
-                        missing_files.append(input_path)
-                i += 2
-            else:
-                i += 1
+        missing_files = CommandRetryHandler._missing_paths(CommandRetryHandler._local_input_paths(cmd))
 
         if missing_files:
             return f"Input file(s) not found: {', '.join(missing_files)}"
         return ""
 
-    def _build_quick_validation_cmd(self, cmd: list[str]) -> list[str] | None:
+    @staticmethod
+    def _build_quick_validation_cmd(cmd: list[str]) -> list[str] | None:
         """Build a quick validation command for syntax checking."""
         if not cmd or cmd[0] != "ffmpeg":
             return None
 
-        validation_cmd = cmd.copy()
-        last_input_idx = -1
-        for i, arg in enumerate(validation_cmd):
-            if arg == "-i":
-                last_input_idx = i + 1
+        # Only report errors unless the command sets its own verbosity, and skip the banner
+        verbosity = [] if "-v" in cmd else ["-v", "error"]
+        if "-hide_banner" not in cmd:
+            verbosity.append("-hide_banner")
 
-        if last_input_idx > 0 and last_input_idx < len(validation_cmd):
-            validation_cmd.insert(last_input_idx + 1, "-t")
-            validation_cmd.insert(last_input_idx + 2, "0.001")
+        # Limit decoding to a few milliseconds by placing -t right after the last input
+        last_input_value_idx = next((i + 1 for i in range(len(cmd) - 1, -1, -1) if cmd[i] == "-i"), -1)
+        if 0 < last_input_value_idx < len(cmd):
+            split = last_input_value_idx + 1
+            return [cmd[0], *verbosity, *cmd[1:split], "-t", "0.001", *cmd[split:]]
 
-        return validation_cmd
+        return [cmd[0], *verbosity, *cmd[1:]]
 
     def execute_with_retry(
         self,
@@ -134,53 +398,85 @@ class CommandRetryHandler:
         for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
             logger.debug(f"Execution attempt {attempt}/{MAX_RETRY_ATTEMPTS}")
 
-            for i, cmd in enumerate(current_commands):
-                is_valid, error_msg = self.validate_ffmpeg_command(cmd)
-                if not is_valid:
-                    logger.warning(f"Command {i+1} validation failed: {error_msg}")
-                    if attempt < MAX_RETRY_ATTEMPTS:
-                        self._console.print(
-                            f"[yellow]Command validation failed: {error_msg}[/yellow]"
-                        )
-                        self._console.print(
-                            f"[yellow]Attempting to regenerate (attempt {attempt}/{MAX_RETRY_ATTEMPTS})...[/yellow]"
-                        )
-                        current_commands, current_plan = self._regenerate_commands(
-                            original_prompt, workspace, error_msg, timeout, assume_yes
-                        )
-                        if current_commands is None:
-                            return 1, commands
-                        break
-            else:
-                try:
-                    exit_code = executor_func(current_commands)
-                    if exit_code == 0:
-                        return 0, current_commands
-                    return exit_code, current_commands
-
-                except ExecError as e:
-                    last_error = str(e)
-                    logger.warning(f"Execution failed on attempt {attempt}: {last_error}")
-
-                    if attempt < MAX_RETRY_ATTEMPTS:
-                        self._console.print(
-                            Panel(
-                                f"[yellow]Execution failed: {last_error[:200]}...[/yellow]\n\n"
-                                f"Attempting to regenerate command (attempt {attempt + 1}/{MAX_RETRY_ATTEMPTS})...",
-                                title="[bold yellow]Retry[/bold yellow]",
-                                border_style="yellow",
-                            )
-                        )
-                        current_commands, current_plan = self._regenerate_commands(
-                            original_prompt, workspace, last_error, timeout, assume_yes
-                        )
-                        if current_commands is None:
-                            raise
-                    else:
+            failure = self._first_validation_failure(current_commands)
+            if failure is not None:
+                i, error_msg = failure
+                logger.warning(f"Command {i+1} validation failed: {error_msg}")
+                if attempt < MAX_RETRY_ATTEMPTS:
+                    self._console.print(
+                        f"[yellow]Command validation failed: {error_msg}[/yellow]\n"
+                        f"[yellow]Attempting to regenerate (attempt {attempt}/{MAX_RETRY_ATTEMPTS})...[/yellow]"
+                    )
+                    current_commands, current_plan = self._regenerate_commands(
+                        original_prompt, workspace, error_msg, timeout, assume_yes
+                    )
+                    if current_commands is None:
+                        return 1, commands
+                    continue
+
+            # On the final attempt, commands are executed even if validation failed
+            try:
+                exit_code = executor_func(current_commands)
+                if exit_code == 0:
+                    return 0, current_commands
+                return exit_code, current_commands
+
+            except ExecError as e:
+                last_error = str(e)
+                logger.warning(f"Execution failed on attempt {attempt}: {last_error}")
+
+                if attempt < MAX_RETRY_ATTEMPTS:
+                    message = _RETRY_PANEL_TEMPLATE.format(
+                        error=last_error[:200], attempt=attempt + 1, total=MAX_RETRY_ATTEMPTS
+                    )
+                    self._console.print(Panel(message, title=_RETRY_PANEL_TITLE, border_style="yellow"))
+                    current_commands, current_plan = self._regenerate_commands(
+                        original_prompt, workspace, last_error, timeout, assume_yes
+                    )
+                    if current_commands is None:
                         raise
+                else:
+                    raise
 
         return 1, current_commands
 
+    def _first_validation_failure(self, commands: list[list[str]]) -> tuple[int, str] | None:
+        """Validate distinct commands concurrently and return the first failure.
+
+        Each validation mostly waits on an ffmpeg subprocess, so threads overlap
+        the waits. Identical commands are validated once. As soon as the earliest
+        failing command is known, validations that have not started are cancelled.
+        Validations already running are waited for before returning, since the
+        quick check writes to the command's real output paths and must not race
+        with regeneration or execution of the next commands.
+
+        Returns:
+            (index, error_msg) of the first failing command in command order, or
+            None when every command is valid.
+        """
+        first_index: dict[tuple[str, ...], int] = {}
+        for i, cmd in enumerate(commands):
+            first_index.setdefault(tuple(cmd), i)
+
+        max_workers = min(len(first_index), MAX_VALIDATION_WORKERS, os.cpu_count() or 1)
+        if max_workers <= 1:
+            for i in first_index.values():
+                is_valid, error_msg = self.validate_ffmpeg_command(commands[i])
+                if not is_valid:
+                    return i, error_msg
+            return None
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [(i, executor.submit(self.validate_ffmpeg_command, commands[i])) for i in first_index.values()]
+            for i, future in futures:
+                is_valid, error_msg = future.result()
+                if not is_valid:
+                    return i, error_msg
+            return None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def _regenerate_commands(
         self,
         original_prompt: str,
@@ -204,10 +500,9 @@ class CommandRetryHandler:
 
             logger.debug(f"Regenerated {len(new_commands)} commands")
 
-            # Show preview of regenerated commands
-            self._console.print("\n[bold green]Regenerated commands:[/bold green]")
-            for i, cmd in enumerate(new_commands, 1):
-                self._console.print(f"  {i}. {' '.join(cmd[:10])}...")
+            # Show preview of regenerated commands in a single console write
+            preview_lines = [f"  {i}. {' '.join(cmd[:10])}..." for i, cmd in enumerate(new_commands, 1)]
+            self._console.print("\n".join(["\n[bold green]Regenerated commands:[/bold green]", *preview_lines]))
 
             return new_commands, new_plan
 
@@ -233,36 +528,15 @@ class CommandRetryHandler:
 
     def _extract_error_summary(self, error_message: str) -> str:
         """Extract the most relevant part of an error message."""
-        error_patterns = [
-            "Invalid data found",
-            "Unknown encoder",
-            "Unknown decoder",
-            "Encoder not found",
-            "Decoder not found",
-            "No such file or directory",
-            "Permission denied",
-            "Invalid argument",
-            "Unrecognized option",
-            "does not support",
-            "codec not currently supported",
-            "Invalid option",
-            "Error while opening",
-            "Output file",
-            "cannot be used together",
-        ]
-
-        lines = error_message.split("\n")
-        relevant_lines = []
-
-        for line in lines:
-            line_lower = line.lower()
-            if any(pattern.lower() in line_lower for pattern in error_patterns):
-                relevant_lines.append(line.strip())
-            elif "error" in line_lower:
-                relevant_lines.append(line.strip())
+        # Hyperscan matches ASCII case-insensitively only, so other text keeps the Unicode-aware regex
+        db = _error_pattern_db()
+        if db is not None and error_message.isascii():
+            relevant_lines = _hyperscan_error_lines(db, error_message.encode("ascii"))
+        else:
+            relevant_lines = [line.strip() for line in error_message.split("\n") if _ERROR_LINE_RE.search(line)]
 
         if relevant_lines:
-            return "\n".join(relevant_lines[:3])
+            return "\n".join(relevant_lines[:MAX_ERROR_SUMMARY_LINES])
 
         return error_message[:200] if len(error_message) > 200 else error_message
 
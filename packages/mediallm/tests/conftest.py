@@ -5,6 +5,10 @@ Author: Arun Brahma
 """
 
 import json
+import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -282,6 +286,48 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "slow: Slow running tests - performance or comprehensive tests")
     config.addinivalue_line("markers", "requires_ollama: Tests requiring Ollama server to be running")
     config.addinivalue_line("markers", "requires_ffmpeg: Tests requiring FFmpeg to be available")
+    _use_tmpfs_basetemp(config)
+
+
+_tmpfs_basetemp_key = pytest.StashKey[str]()
+
+
+def _use_tmpfs_basetemp(config):
+    """Keep pytest's temporary directories in the in-memory runtime dir on Linux.
+
+    Opt-in via MEDIALLM_TEST_TMPFS=1, so filesystem-heavy tests can avoid disk I/O.
+    XDG_RUNTIME_DIR (/run/user/<uid>) is used rather than /dev/shm because
+    is_safe_path rejects everything under /dev. An explicit --basetemp always wins.
+    """
+    if os.environ.get("MEDIALLM_TEST_TMPFS", "").lower() not in {"1", "true", "yes"}:
+        return
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    # xdist workers inherit the controller's basetemp
+    if config.option.basetemp or hasattr(config, "workerinput") or sys.platform != "linux":
+        return
+    if not runtime_dir or not os.access(runtime_dir, os.W_OK):
+        return
+    try:
+        basetemp = tempfile.mkdtemp(prefix="mediallm-pytest-", dir=runtime_dir)
+    except OSError:
+        return
+    # Symlink tests need a filesystem that supports them; otherwise keep the default location
+    probe = os.path.join(basetemp, "symlink-probe")
+    try:
+        os.symlink(basetemp, probe)
+        os.unlink(probe)
+    except OSError:
+        shutil.rmtree(basetemp, ignore_errors=True)
+        return
+    config.option.basetemp = basetemp
+    config.stash[_tmpfs_basetemp_key] = basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the in-memory base directory created for this run."""
+    basetemp = config.stash.get(_tmpfs_basetemp_key, None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
 
 
 # Mock constants for consistent testing
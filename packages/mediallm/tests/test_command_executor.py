@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Author: Arun Brahma
+"""Tests for running commands in CommandExecutor, using a stub ffmpeg executable."""
+
+from __future__ import annotations
+
+import stat
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from mediallm.processing.command_executor import STDERR_TAIL_SIZE
+from mediallm.processing.command_executor import CommandExecutor
+from mediallm.utils.exceptions import ExecError
+
+# Behaviour is picked from the output name (the last argument): "late" and "slow" sleep first,
+# "noisy" writes 1 MiB of progress lines to stderr, "fail" exits 1 with a final message on
+# stderr, and every other run creates the output file
+_STUB_FFMPEG = """#!/bin/sh
+for out; do :; done
+case "$out" in
+  *late*) sleep 0.1 ;;
+  *slow*) sleep 0.5 ;;
+  *noisy*) yes "frame=1 fps=0.0 q=0.0 size=0kB" | head -c 1048576 >&2 ;;
+esac
+case "$out" in
+  *fail*) echo "stub failure for $out" >&2; exit 1 ;;
+esac
+: > "$out"
+"""
+
+
+@pytest.fixture
+def stub_ffmpeg(tmp_path: Path) -> str:
+    """Write the stub ffmpeg script and return its absolute path."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(_STUB_FFMPEG)
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    return str(script)
+
+
+@pytest.fixture
+def executor() -> CommandExecutor:
+    """Create an executor whose console output is recorded instead of printed."""
+    return CommandExecutor(console=Mock())
+
+
+def _commands(stub_ffmpeg: str, out_dir: Path, *names: str) -> list[list[str]]:
+    """Build one stub command per output name."""
+    return [[stub_ffmpeg, "-i", "in.mp4", str(out_dir / name)] for name in names]
+
+
+class TestConcurrentExecution:
+    """Test suite for running independent commands on a thread pool."""
+
+    def test_runs_every_command(self, executor: CommandExecutor, stub_ffmpeg: str, tmp_path: Path) -> None:
+        """Test that all commands run and are counted as successful."""
+        commands = _commands(stub_ffmpeg, tmp_path, "a.mp4", "b.mp4", "c.mp4")
+
+        assert executor._execute_commands_concurrently(commands, max_workers=3) == 3
+        assert all(Path(cmd[-1]).exists() for cmd in commands)
+
+    def test_failure_is_reported_in_command_order(
+        self, executor: CommandExecutor, stub_ffmpeg: str, tmp_path: Path
+    ) -> None:
+        """Test that the first failing command is reported even if a later one fails sooner."""
+        commands = _commands(stub_ffmpeg, tmp_path, "late_fail.mp4", "fail.mp4")
+
+        with pytest.raises(ExecError, match="late_fail.mp4"):
+            executor._execute_commands_concurrently(commands, max_workers=2)
+
+        assert executor.console.print.call_args_list[-1].args[0].startswith("[red]Command 1 failed:[/red]")
+
+    def test_pending_commands_are_cancelled(self, executor: CommandExecutor, stub_ffmpeg: str, tmp_path: Path) -> None:
+        """Test that commands not yet started when a failure is seen never run."""
+        # Two workers: both stay busy with "slow" commands after the first command fails
+        commands = _commands(stub_ffmpeg, tmp_path, "late_fail.mp4", "slow_b.mp4", "slow_c.mp4", "d.mp4", "e.mp4")
+
+        with pytest.raises(ExecError):
+            executor._execute_commands_concurrently(commands, max_workers=2)
+
+        assert Path(commands[1][-1]).exists()
+        assert not Path(commands[3][-1]).exists()
+        assert not Path(commands[4][-1]).exists()
+
+    def test_run_raises_exec_error_on_failure(
+        self, executor: CommandExecutor, stub_ffmpeg: str, tmp_path: Path
+    ) -> None:
+        """Test that run() with concurrency surfaces a failing command as ExecError."""
+        commands = _commands(stub_ffmpeg, tmp_path, "a.mp4", "fail.mp4")
+
+        with pytest.raises(ExecError, match="stub failure for"):
+            executor.run(commands, confirm=True, dry_run=False, show_preview=False, concurrency=2)
+
+
+class TestStderrTail:
+    """Test suite for keeping only the tail of a command's stderr."""
+
+    @pytest.mark.parametrize("name", ["fail.mp4", "noisy_fail.mp4"])
+    def test_exec_error_includes_stderr_tail(
+        self, executor: CommandExecutor, stub_ffmpeg: str, tmp_path: Path, name: str
+    ) -> None:
+        """Test that the last stderr line reaches the ExecError, also after large output."""
+        [cmd] = _commands(stub_ffmpeg, tmp_path, name)
+
+        with pytest.raises(ExecError, match=f"stub failure for .*{name}"):
+            executor._execute_single_command(cmd, 1, 1)
+
+    def test_large_stderr_is_drained_and_bounded(self, stub_ffmpeg: str, tmp_path: Path) -> None:
+        """Test that 1 MiB of stderr neither blocks the command nor is kept in full."""
+        [cmd] = _commands(stub_ffmpeg, tmp_path, "noisy_fail.mp4")
+
+        returncode, tail = CommandExecutor._run_streaming(cmd, timeout=30)
+
+        assert returncode == 1
+        assert len(tail) <= STDERR_TAIL_SIZE
+        assert tail.endswith(f"stub failure for {cmd[-1]}\n".encode())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# Author: Arun Brahma
+"""Tests for FFmpeg command validation in CommandRetryHandler."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from types import SimpleNamespace
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from mediallm.processing import command_retry
+from mediallm.processing.command_retry import CommandRetryHandler
+
+_STUB_ENCODERS = frozenset({"libx264", "aac"})
+_STUB_FILTERS = frozenset({"scale", "fps", "select", "drawtext", "volume"})
+
+
+def _stub_codec(name: str, mode: str) -> object:
+    """Mimic av.codec.Codec, which raises for codecs missing from the libav build."""
+    if mode != "w" or name not in _STUB_ENCODERS:
+        raise ValueError(name)
+    return object()
+
+
+@pytest.fixture
+def stub_av(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Install a stand-in PyAV module that knows a fixed set of encoders and filters."""
+    av = SimpleNamespace(
+        codec=SimpleNamespace(Codec=_stub_codec),
+        filter=SimpleNamespace(filters_available=_STUB_FILTERS),
+    )
+    monkeypatch.setattr(command_retry, "av", av)
+    command_retry._pyav_has_encoder.cache_clear()
+    yield av
+    command_retry._pyav_has_encoder.cache_clear()
+
+
+@pytest.fixture
+def handler() -> CommandRetryHandler:
+    """Create a retry handler with a resolved ffmpeg path and no cached validations."""
+    CommandRetryHandler._validate_cached.cache_clear()
+    retry_handler = CommandRetryHandler(Mock(), console=Mock())
+    retry_handler._ffmpeg_path = "/usr/bin/ffmpeg"
+    yield retry_handler
+    CommandRetryHandler._validate_cached.cache_clear()
+
+
+class TestPyAVPreCheck:
+    """Test suite for the optional in-process PyAV pre-check."""
+
+    @pytest.mark.parametrize(
+        "graph",
+        [
+            "scale=1280:720,fps=30",
+            "select='gt(scene,0.4)',scale=640:-1",
+            "select=eq(n\\,0)",
+            "drawtext=text='Hello, world':x=10:y=10",
+            "[0:v]scale=640:360[a];[a]fps=24[b]",
+            # Unbalanced quoting is left to ffmpeg
+            "drawtext=text='Hello, world",
+        ],
+    )
+    def test_known_filters_are_passed_on(self, stub_av: SimpleNamespace, graph: str) -> None:
+        """Test that separators inside quoted or escaped arguments are not read as filter names."""
+        cmd = ["ffmpeg", "-i", "in.mp4", "-vf", graph, "out.mp4"]
+        assert command_retry._pyav_rejection(cmd) is None
+
+    def test_unknown_filter_is_rejected(self, stub_av: SimpleNamespace) -> None:
+        """Test that a filter missing from PyAV's build is reported by name."""
+        cmd = ["ffmpeg", "-i", "in.mp4", "-filter_complex", "[0:v]scale=640:360[a];[a]blur[b]", "out.mp4"]
+        assert command_retry._pyav_rejection(cmd) == "No such filter: 'blur'"
+
+    def test_decoder_before_input_is_not_checked(self, stub_av: SimpleNamespace) -> None:
+        """Test that codec flags before the last input select decoders and are left to ffmpeg."""
+        cmd = ["ffmpeg", "-c:v", "h264_cuvid", "-i", "in.mp4", "-c:v", "libx264", "-c:a", "copy", "out.mp4"]
+        assert command_retry._pyav_rejection(cmd) is None
+
+    def test_unknown_encoder_is_rejected(self, stub_av: SimpleNamespace) -> None:
+        """Test that an encoder after the last input missing from PyAV's build is rejected."""
+        cmd = ["ffmpeg", "-i", "a.mp4", "-i", "b.wav", "-c:v", "libx264", "-c:a", "libfdk_aac", "out.mp4"]
+        assert command_retry._pyav_rejection(cmd) == "Unknown encoder 'libfdk_aac'"
+
+    def test_rejection_skips_ffmpeg(self, stub_av: SimpleNamespace, handler: CommandRetryHandler) -> None:
+        """Test that a PyAV rejection is returned without spawning ffmpeg."""
+        cmd = ["ffmpeg", "-i", "in.mp4", "-c:v", "libfoo", "out.mp4"]
+        with (
+            patch.object(CommandRetryHandler, "_check_input_files", return_value=""),
+            patch.object(command_retry.subprocess, "run") as mock_run,
+        ):
+            assert handler.validate_ffmpeg_command(cmd) == (False, "FFmpeg validation failed: Unknown encoder 'libfoo'")
+        mock_run.assert_not_called()
+
+    def test_passed_command_is_still_checked_by_ffmpeg(
+        self, stub_av: SimpleNamespace, handler: CommandRetryHandler
+    ) -> None:
+        """Test that a command PyAV does not reject still goes through the ffmpeg quick check."""
+        cmd = ["ffmpeg", "-i", "in.mp4", "-c:v", "libx264", "out.mp4"]
+        failed_run = Mock(returncode=1, stderr=b"Invalid argument\n")
+        with (
+            patch.object(CommandRetryHandler, "_check_input_files", return_value=""),
+            patch.object(command_retry.subprocess, "run", return_value=failed_run) as mock_run,
+        ):
+            assert handler.validate_ffmpeg_command(cmd) == (False, "FFmpeg validation failed: Invalid argument")
+        mock_run.assert_called_once()
+
+
+class TestValidationCache:
+    """Test suite for caching of ffmpeg quick-check results."""
+
+    @pytest.fixture
+    def input_file(self, tmp_path) -> str:
+        """Create a local input file for the validated command."""
+        path = tmp_path / "in.mp4"
+        path.write_bytes(b"fake video")
+        return str(path)
+
+    @pytest.fixture(autouse=True)
+    def without_pyav(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Validate with ffmpeg only, whatever MEDIALLM_USE_PYAV is set to."""
+        monkeypatch.setattr(command_retry, "av", None)
+
+    def test_repeated_command_does_not_spawn_ffmpeg_again(self, handler: CommandRetryHandler, input_file: str) -> None:
+        """Test that an unchanged command is answered from the cache."""
+        cmd = ["ffmpeg", "-i", input_file, "out.mp4"]
+        with patch.object(command_retry.subprocess, "run", return_value=Mock(returncode=0, stderr=b"")) as mock_run:
+            assert handler.validate_ffmpeg_command(cmd) == (True, "")
+            assert handler.validate_ffmpeg_command(list(cmd)) == (True, "")
+        mock_run.assert_called_once()
+
+    def test_input_mtime_change_invalidates_entry(self, handler: CommandRetryHandler, input_file: str) -> None:
+        """Test that modifying an input file makes the command be probed again."""
+        cmd = ["ffmpeg", "-i", input_file, "out.mp4"]
+        with patch.object(command_retry.subprocess, "run", return_value=Mock(returncode=0, stderr=b"")) as mock_run:
+            handler.validate_ffmpeg_command(cmd)
+            stat = os.stat(input_file)
+            os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            handler.validate_ffmpeg_command(cmd)
+        assert mock_run.call_count == 2
+
+    @pytest.mark.parametrize(
+        "failure",
+        [subprocess.TimeoutExpired("ffmpeg", command_retry.FFMPEG_VALIDATION_TIMEOUT), OSError("fork failed")],
+    )
+    def test_unfinished_check_is_not_cached(
+        self, handler: CommandRetryHandler, input_file: str, failure: Exception
+    ) -> None:
+        """Test that a timeout or unexpected error lets the command through without caching it."""
+        cmd = ["ffmpeg", "-i", input_file, "out.mp4"]
+        with patch.object(command_retry.subprocess, "run", side_effect=failure) as mock_run:
+            assert handler.validate_ffmpeg_command(cmd) == (True, "")
+            assert handler.validate_ffmpeg_command(cmd) == (True, "")
+        assert mock_run.call_count == 2
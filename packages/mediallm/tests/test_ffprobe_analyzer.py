@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Author: Arun Brahma
+"""Tests for media duration extraction in the ffprobe analyzer."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pytest
+
+from mediallm.analysis import ffprobe_analyzer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def media_file(tmp_path: Path) -> Path:
+    """Create a placeholder media file."""
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"not really a video")
+    return path
+
+
+@pytest.fixture
+def ffprobe_duration(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Replace the ffprobe fallback with a mock reporting 12.5 seconds."""
+    mock = Mock(return_value=12.5)
+    monkeypatch.setattr(ffprobe_analyzer, "_ffprobe_duration", mock)
+    return mock
+
+
+def _mutagen_reporting(length: float) -> Mock:
+    """Build a stand-in for mutagen.File whose parsed file reports the given length."""
+    return Mock(return_value=SimpleNamespace(info=SimpleNamespace(length=length)))
+
+
+class TestDurationExtraction:
+    """Test suite for reading durations with mutagen and falling back to ffprobe."""
+
+    def test_mutagen_duration_is_used(
+        self, monkeypatch: pytest.MonkeyPatch, media_file: Path, ffprobe_duration: Mock
+    ) -> None:
+        """Test that a duration read by mutagen is returned without running ffprobe."""
+        monkeypatch.setattr(ffprobe_analyzer, "MutagenFile", _mutagen_reporting(3.25))
+
+        assert ffprobe_analyzer._extract_duration(media_file) == 3.25
+        ffprobe_duration.assert_not_called()
+
+    def test_falls_back_when_mutagen_is_not_installed(
+        self, monkeypatch: pytest.MonkeyPatch, media_file: Path, ffprobe_duration: Mock
+    ) -> None:
+        """Test that ffprobe is used when mutagen is not installed."""
+        monkeypatch.setattr(ffprobe_analyzer, "MutagenFile", None)
+
+        assert ffprobe_analyzer._mutagen_duration(media_file) is None
+        assert ffprobe_analyzer._extract_duration(media_file) == 12.5
+        ffprobe_duration.assert_called_once_with(media_file)
+
+    @pytest.mark.parametrize(
+        "mutagen_file",
+        [
+            Mock(side_effect=ValueError("cannot parse header")),
+            # mutagen.File returns None for formats it does not recognise (e.g. Matroska)
+            Mock(return_value=None),
+        ],
+    )
+    def test_falls_back_when_file_is_unparseable(
+        self, monkeypatch: pytest.MonkeyPatch, media_file: Path, ffprobe_duration: Mock, mutagen_file: Mock
+    ) -> None:
+        """Test that ffprobe is used when mutagen cannot read the file."""
+        monkeypatch.setattr(ffprobe_analyzer, "MutagenFile", mutagen_file)
+
+        assert ffprobe_analyzer._mutagen_duration(media_file) is None
+        assert ffprobe_analyzer._extract_duration(media_file) == 12.5
+        ffprobe_duration.assert_called_once_with(media_file)
+
+    def test_falls_back_on_zero_length(
+        self, monkeypatch: pytest.MonkeyPatch, media_file: Path, ffprobe_duration: Mock
+    ) -> None:
+        """Test that a zero length from mutagen is treated as unknown and probed with ffprobe."""
+        monkeypatch.setattr(ffprobe_analyzer, "MutagenFile", _mutagen_reporting(0.0))
+
+        assert ffprobe_analyzer._extract_duration(media_file) == 12.5
+        ffprobe_duration.assert_called_once_with(media_file)
@@ -26,6 +26,19 @@ class TestMainEntryPoint:
             main_module.main()
             mock_app.assert_called_once()
 
+    def test_main_version_flag_skips_cli(self, capsys):
+        """Test --version prints the version without starting the CLI app."""
+        with patch("sys.argv", ["mediallm", "--version"]), patch("mediallm.main.terminal_app") as mock_app:
+            main_module.main()
+            mock_app.assert_not_called()
+        assert capsys.readouterr().out.startswith("mediallm ")
+
+    def test_main_version_flag_in_prompt_runs_cli(self):
+        """Test a version flag alongside other arguments is left to the CLI app."""
+        with patch("sys.argv", ["mediallm", "explain what -V does"]), patch("mediallm.main.terminal_app") as mock_app:
+            main_module.main()
+            mock_app.assert_called_once()
+
     def test_environment_validation_python_version(self):
         """Test Python version validation functionality."""
         # Skip this test since the global fixture already mocks environment validation
@@ -35,7 +48,7 @@ class TestMainEntryPoint:
 
     def test_environment_validation_missing_modules(self):
         """Test validation fails with missing required modules."""
-        with patch("builtins.__import__", side_effect=ImportError("No module named 'rich'")):
+        with patch("mediallm.main.find_spec", return_value=None):
             with pytest.raises(SystemExit) as exc_info:
                 main_module._check_required_modules()
             assert exc_info.value.code == 1
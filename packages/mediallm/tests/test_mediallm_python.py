@@ -4,6 +4,8 @@ Comprehensive unit tests for MediaLLM Python wrapper.
 Author: Arun Brahma
 """
 
+import asyncio
+import time
 from pathlib import Path
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -12,6 +14,7 @@ import pytest
 
 from mediallm import MediaLLM
 from mediallm import discover_media
+from mediallm.core.json_repair import JSONRepair
 from mediallm.utils.data_models import Action
 from mediallm.utils.data_models import CommandEntry
 from mediallm.utils.data_models import CommandPlan
@@ -316,6 +319,20 @@ class TestMediaLLMCommandGeneration:
                             with pytest.raises(RuntimeError, match="Failed to generate plan"):
                                 mediallm.generate_command("convert video")
 
+    def test_agenerate_many_preserves_order(self, sample_workspace):
+        """Test agenerate_many returns one command list per request, in order."""
+        mediallm = MediaLLM(workspace=sample_workspace)
+        requests = ["convert a.mp4", "convert b.mp4", "convert c.mp4"]
+
+        def fake_generate_commands(request, assume_yes=True, output_dir=None):
+            return [["ffmpeg", "-i", request.split()[-1], "out.mp4"]]
+
+        with patch.object(mediallm, "generate_commands", side_effect=fake_generate_commands) as mock_generate:
+            results = asyncio.run(mediallm.agenerate_many(requests, max_concurrency=2))
+
+        assert [r[0][2] for r in results] == ["a.mp4", "b.mp4", "c.mp4"]
+        assert mock_generate.call_count == 3
+
 
 class TestMediaLLMWorkspace:
     """Test MediaLLM workspace functionality."""
@@ -362,6 +379,37 @@ class TestMediaLLMWorkspace:
                 assert mediallm._workspace == sample_workspace
                 mock_discover.assert_called_once_with(cwd=Path(custom_dir), show_summary=False)
 
+    def test_lazy_workspace_scanned_per_instance(self, tmp_path, sample_workspace):
+        """Test each instance scans its working directory instead of sharing a stale result."""
+        with patch("mediallm.api.discover_media", return_value=sample_workspace) as mock_discover:
+            first = MediaLLM(working_dir=tmp_path).workspace
+            second = MediaLLM(working_dir=tmp_path).workspace
+
+            assert first == second == sample_workspace
+            assert mock_discover.call_count == 2
+
+    def test_concurrent_calls_share_one_lazy_scan(self, tmp_path, sample_workspace):
+        """Test concurrent async calls on a fresh instance trigger a single workspace scan."""
+        mediallm = MediaLLM(working_dir=tmp_path)
+
+        def slow_discover(cwd, show_summary):
+            # Hold the scan open long enough for every worker thread to reach it
+            time.sleep(0.05)
+            return sample_workspace
+
+        async def generate_all():
+            return await asyncio.gather(*(mediallm.agenerate_plan(f"convert clip{i}.mp4") for i in range(4)))
+
+        with (
+            patch("mediallm.api.discover_media", side_effect=slow_discover) as mock_discover,
+            patch.object(mediallm, "_get_llm", return_value=Mock()),
+            patch("mediallm.api.dispatch_task", return_value=Mock()),
+        ):
+            plans = asyncio.run(generate_all())
+
+        assert len(plans) == 4
+        mock_discover.assert_called_once_with(cwd=tmp_path, show_summary=False)
+
     def test_available_files_property(self, sample_workspace):
         """Test available_files property."""
         mock_ollama = Mock()
@@ -526,6 +574,37 @@ class TestErrorHandling:
                             assert exc_info.value.__cause__ == original_error
 
 
+class TestJSONRepairWorkspaceMatching:
+    """Test path matching against workspaces with precomputed lowercase file lists."""
+
+    def test_sanitize_uses_precomputed_lowercase_paths(self, sample_workspace):
+        """Test that "<key>_lower" lists are used to resolve paths to their original spelling."""
+        workspace = {
+            **sample_workspace,
+            "videos": ["Clips/Test_Video.MP4"],
+            "videos_lower": ["clips/test_video.mp4"],
+        }
+        data = {"inputs": ["test_video.mp4 - source file"], "output": "clips/test_video.mp4 (trimmed)"}
+
+        result = JSONRepair.sanitize_path_values(data, workspace)
+
+        assert result["inputs"] == ["Clips/Test_Video.MP4"]
+        assert result["output"] == "Clips/Test_Video.MP4"
+
+    def test_repair_ignores_mismatched_lowercase_list(self, sample_workspace):
+        """Test that a "<key>_lower" list of the wrong length is recomputed instead of zipped."""
+        workspace = {
+            **sample_workspace,
+            "audios": ["Podcast.WAV", "Song.MP3"],
+            "audios_lower": ["podcast.wav"],
+        }
+        data = {"action": "extract_audio", "inputs": ["song.mp3"], "output": "out.mp3"}
+
+        result = JSONRepair.repair_json_for_schema(data, "extract audio from song.mp3", workspace)
+
+        assert result["inputs"] == ["Song.MP3"]
+
+
 @pytest.mark.parametrize(
     ("action", "expected_codec"),
     [
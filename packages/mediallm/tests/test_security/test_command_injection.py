@@ -55,6 +55,13 @@ class TestCommandInjectionPrevention:
             ["ffmpeg", "-i", "test.mp4", "format", "C:"],
             # Output redirection to system file
             ["ffmpeg", "-i", "test.mp4", ">/etc/passwd"],
+            # Keyword completed by the next argument, also across blank arguments
+            ["ffmpeg", "-i", "test.mp4", "system", "(", "out.mp4"],
+            ["ffmpeg", "-i", "test.mp4", "rm", "", "-rf", "out.mp4"],
+            ["ffmpeg", "-i", "test.mp4", "rm", ""],
+            # Keyword followed by a bare trailing filter flag
+            ["ffmpeg", "-i", "a.mp4", "rm", "-vf"],
+            ["ffmpeg", "rm", "-filter_complex"],
         ],
     )
     def test_rejects_shell_injection(
@@ -100,6 +107,13 @@ class TestCommandInjectionPrevention:
             ["ffmpeg", "-i", "deleted_scenes.mp4", "-c:v", "libx264", "output.mp4"],
             # Hardware acceleration flag (valid ffmpeg)
             ["ffmpeg", "-hwaccel", "cuda", "-i", "video.mp4", "output.mp4"],
+            # Arguments ending in a keyword that the next argument does not complete
+            ["ffmpeg", "-i", "video.mp4", "-metadata", "comment=format", "output.mp4"],
+            ["ffmpeg", "-i", "video.mp4", "-metadata", "title=dd", "output.mp4"],
+            ["ffmpeg", "-i", "video.mp4", "-metadata", "artist=Eval", "output.mp4"],
+            ["ffmpeg", "-i", "video.mp4", "-metadata", "title=Exec", "-c", "copy", "output.mp4"],
+            ["ffmpeg", "-i", "system", "output.mp4"],
+            ["ffmpeg", "-i", "video.mp4", "-f", "format", "output.mp4"],
         ],
     )
     def test_allows_safe_commands(
@@ -120,6 +134,9 @@ class TestCommandInjectionPrevention:
             ["sh", "-c", "ls"],
             ["curl", "http://example.com"],
             ["wget", "http://example.com"],
+            # Names that merely end with an allowed executable
+            ["evil_ffmpeg", "-i", "video.mp4", "out.mp4"],
+            ["/tmp/notffprobe", "video.mp4"],
             # Empty command
             [],
             # None-like command
@@ -151,6 +168,15 @@ class TestCommandInjectionPrevention:
             safe_ffprobe
         ), "ffprobe commands should be allowed"
 
+    @pytest.mark.security
+    @pytest.mark.parametrize(
+        "executable",
+        ["/usr/local/bin/ffmpeg", "C:\\ffmpeg\\bin\\ffmpeg.exe", "ffprobe.exe"],
+    )
+    def test_allows_executable_paths(self, executor: CommandExecutor, executable: str) -> None:
+        """Test that absolute paths and Windows .exe names of ffmpeg/ffprobe are allowed."""
+        assert executor._is_command_secure([executable, "-i", "video.mp4", "out.mp4"])
+
     @pytest.mark.security
     def test_word_boundary_prevents_false_positives(
         self, executor: CommandExecutor
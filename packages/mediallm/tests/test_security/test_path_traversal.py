@@ -1,109 +1,225 @@
 #!/usr/bin/env python3
 # Author: Arun Brahma
-"""Tests for path traversal prevention in MediaLLM."""
+"""Tests for path traversal prevention in MediaLLM.
+
+The module holds no shared mutable state, so it can run in parallel:
+``pytest -n auto -m security``.
+"""
 
 from __future__ import annotations
 
+import functools
+import os
+import re
+import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 from mediallm.processing.media_file_handler import MediaFileHandler
 from mediallm.processing.media_file_handler import expand_globs
 from mediallm.processing.media_file_handler import is_safe_path
-from mediallm.safety.access_control import AccessController
+from mediallm.processing.media_file_handler import sanitize_filename
+
+# Test inputs; each rejection list is checked in bulk by a single test
+MALICIOUS_PATHS = (
+    # Unix path traversal
+    "../../../etc/passwd",
+    "../../etc/shadow",
+    "/etc/passwd",
+    "/proc/self/environ",
+    "/sys/kernel/debug",
+    "/dev/sda",
+    "/boot/vmlinuz",
+    # Windows path traversal
+    "..\\..\\windows\\system32\\config\\sam",
+    "C:\\Windows\\System32\\config\\SAM",
+    "..\\..\\..\\windows\\system32",
+    # Mixed traversal
+    "input/../../../etc/passwd",
+    "videos/../../../../../../etc/shadow",
+    # Encoded traversal (these should be literal strings)
+    "../%2e%2e/etc/passwd",
+    # Double encoding
+    "....//....//etc/passwd",
+    # Triple dots (unusual but should be caught)
+    ".../etc/passwd",
+    # Null byte injection (should be sanitized)
+    "../etc/passwd\x00.mp4",
+    # Home directory access
+    "~/.ssh/id_rsa",
+    "~/.aws/credentials",
+    "~/.config/sensitive",
+    # Root paths
+    "/",
+    "\\",
+    "C:\\",
+    "C:/",
+)
+
+SAFE_PATHS = (
+    "video.mp4",
+    "videos/video.mp4",
+    "my_project/media/video.mp4",
+    "video with spaces.mp4",
+    "video-with-dashes.mp4",
+    "video_with_underscores.mp4",
+    "VIDEO.MP4",
+    "video.final.mp4",
+)
+
+DANGEROUS_SYSTEM_PATHS = (
+    "/etc",
+    "/proc",
+    "/sys",
+    "/dev",
+    "/boot",
+    "C:\\Windows",
+    "C:\\System32",
+    "C:\\Program Files",
+)
+
+MALICIOUS_GLOBS = (
+    # Path traversal in glob
+    "../*.mp4",
+    "../../*.mp4",
+    "/**/*.mp4",  # Root glob
+    "/etc/*",
+    "/proc/*",
+    # Dangerous system directories
+    "/etc/passwd*",
+    "/sys/**/*",
+    "~/.ssh/*",
+    "~/.aws/*",
+    # Excessive wildcards (potential DoS)
+    "**********",
+    "{{{{{test}}}}}",
+    # Windows paths
+    "C:\\Windows\\*",
+    "C:\\System32\\*",
+)
+
+SANITIZE_CASES = (
+    # Path traversal in filename
+    ("../../../etc/passwd.mp4", "etc_passwd.mp4"),
+    ("..\\..\\windows\\system.mp4", "windows_system.mp4"),
+    # Shell characters
+    ("video;rm -rf /.mp4", "video_rm_-rf_.mp4"),
+    ("video|cat /etc/passwd.mp4", "video_cat_etc_passwd.mp4"),
+    ("video`whoami`.mp4", "video_whoami_.mp4"),
+    ("video$(ls).mp4", "video__ls_.mp4"),
+    # Null bytes
+    ("video\x00.mp4", "video.mp4"),
+    # Control characters
+    ("video\x01\x02\x03.mp4", "video.mp4"),
+    # Reserved Windows names
+    ("CON.mp4", "safe_CON.mp4"),
+    ("PRN.mp4", "safe_PRN.mp4"),
+    ("AUX.mp4", "safe_AUX.mp4"),
+    ("NUL.mp4", "safe_NUL.mp4"),
+    ("COM1.mp4", "safe_COM1.mp4"),
+    ("LPT1.mp4", "safe_LPT1.mp4"),
+    # Multiple dots (potential extension confusion)
+    ("video..mp4", "video.mp4"),
+    ("video...mp4", "video.mp4"),
+    # Leading/trailing dots
+    (".hidden.mp4", "hidden.mp4"),
+    ("video.", "video"),
+    # Empty or whitespace
+    ("   ", "sanitized_file"),
+    ("", "sanitized_file"),
+)
+
+# Substrings that must never survive filename sanitization: "..", NUL and shell metacharacters
+FORBIDDEN_SANITIZED_RE = re.compile(r"\.\.|\x00|[;|`]")
+
+
+pytestmark = pytest.mark.security
+
+
+@functools.cache
+def _can_symlink() -> bool:
+    """Probe once whether this platform lets the current user create symlinks."""
+    with tempfile.TemporaryDirectory() as probe_dir:
+        try:
+            os.symlink(probe_dir, os.path.join(probe_dir, "link"))
+        except OSError:
+            return False
+    return True
+
+
+@pytest.fixture(scope="module")
+def cwd_allowed() -> list[Path]:
+    """Provide the normal working directory as the allowed list, captured once per module."""
+    return [Path.cwd()]
+
+
+@pytest.fixture(scope="class")
+def safe_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide an allowed directory with the parent directories of SAFE_PATHS created once."""
+    root = tmp_path_factory.mktemp("safe_root")
+    for parent in {os.path.dirname(path) for path in SAFE_PATHS} - {""}:
+        os.makedirs(os.path.join(root, parent))
+    return root
+
+
+@pytest.fixture(scope="module")
+def layout(tmp_path_factory: pytest.TempPathFactory) -> SimpleNamespace:
+    """Provide a read-only allowed/outside directory scaffold shared by containment tests.
+
+    allowed/ holds video1.mp4 and video2.mp4; outside/ holds video3.mp4 and secret.txt.
+    """
+    root = os.fspath(tmp_path_factory.mktemp("layout"))
+    allowed = os.path.join(root, "allowed")
+    outside = os.path.join(root, "outside")
+    os.mkdir(allowed)
+    os.mkdir(outside)
+    for name in (
+        os.path.join(allowed, "video1.mp4"),
+        os.path.join(allowed, "video2.mp4"),
+        os.path.join(outside, "video3.mp4"),
+    ):
+        os.close(os.open(name, os.O_CREAT | os.O_WRONLY, 0o600))
+    with open(os.path.join(outside, "secret.txt"), "w", encoding="utf-8") as f:
+        f.write("secret")
+    # Path objects are only built for the values handed to the code under test
+    return SimpleNamespace(root=Path(root), allowed=Path(allowed), outside=Path(outside))
+
+
+@pytest.fixture(scope="module")
+def allowed_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide one allowed directory shared by read-only rejection cases."""
+    return tmp_path_factory.mktemp("allowed_root")
 
 
 class TestPathTraversalPrevention:
     """Test suite for path traversal attack prevention."""
 
-    @pytest.mark.security
-    @pytest.mark.parametrize(
-        "malicious_path",
-        [
-            # Unix path traversal
-            "../../../etc/passwd",
-            "../../etc/shadow",
-            "/etc/passwd",
-            "/proc/self/environ",
-            "/sys/kernel/debug",
-            "/dev/sda",
-            "/boot/vmlinuz",
-            # Windows path traversal
-            "..\\..\\windows\\system32\\config\\sam",
-            "C:\\Windows\\System32\\config\\SAM",
-            "..\\..\\..\\windows\\system32",
-            # Mixed traversal
-            "input/../../../etc/passwd",
-            "videos/../../../../../../etc/shadow",
-            # Encoded traversal (these should be literal strings)
-            "../%2e%2e/etc/passwd",
-            # Double encoding
-            "....//....//etc/passwd",
-            # Triple dots (unusual but should be caught)
-            ".../etc/passwd",
-            # Null byte injection (should be sanitized)
-            "../etc/passwd\x00.mp4",
-            # Home directory access
-            "~/.ssh/id_rsa",
-            "~/.aws/credentials",
-            "~/.config/sensitive",
-            # Root paths
-            "/",
-            "\\",
-            "C:\\",
-            "C:/",
-        ],
-    )
-    def test_rejects_path_traversal(self, malicious_path: str, tmp_path: Path) -> None:
+    def test_rejects_path_traversal(self, allowed_root: Path) -> None:
         """Test that path traversal attempts are rejected."""
-        allowed = [tmp_path]
-        assert not is_safe_path(
-            malicious_path, allowed
-        ), f"Should reject path traversal: {malicious_path}"
+        allowed = [allowed_root]
+        accepted = [path for path in MALICIOUS_PATHS if is_safe_path(path, allowed)]
+        assert not accepted, f"Should reject path traversal: {accepted}"
 
-    @pytest.mark.security
-    @pytest.mark.parametrize(
-        "safe_path",
-        [
-            "video.mp4",
-            "videos/video.mp4",
-            "my_project/media/video.mp4",
-            "video with spaces.mp4",
-            "video-with-dashes.mp4",
-            "video_with_underscores.mp4",
-            "VIDEO.MP4",
-            "video.final.mp4",
-        ],
-    )
-    def test_allows_safe_paths(self, safe_path: str, tmp_path: Path) -> None:
+    @pytest.mark.parametrize("safe_path", SAFE_PATHS)
+    def test_allows_safe_paths(self, safe_path: str, safe_root: Path) -> None:
         """Test that legitimate paths within allowed directories are accepted."""
-        # Create the actual file/directory structure
-        full_path = tmp_path / safe_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.touch()
+        # Parent directories already exist; only the file itself is created
+        full_path = safe_root / safe_path
+        os.close(os.open(full_path, os.O_CREAT | os.O_WRONLY, 0o600))
 
-        allowed = [tmp_path]
+        allowed = [safe_root]
         assert is_safe_path(
             full_path, allowed
         ), f"Should allow safe path: {safe_path}"
 
-    @pytest.mark.security
-    def test_path_must_be_within_allowed_directories(self, tmp_path: Path) -> None:
+    def test_path_must_be_within_allowed_directories(self, layout: SimpleNamespace) -> None:
         """Test that paths outside allowed directories are rejected."""
-        # Create a file in tmp_path
-        allowed_dir = tmp_path / "allowed"
-        allowed_dir.mkdir()
-        allowed_file = allowed_dir / "video.mp4"
-        allowed_file.touch()
-
-        # Create a file outside allowed directory
-        outside_dir = tmp_path / "outside"
-        outside_dir.mkdir()
-        outside_file = outside_dir / "video.mp4"
-        outside_file.touch()
+        allowed_file = layout.allowed / "video1.mp4"
+        outside_file = layout.outside / "video3.mp4"
 
-        allowed = [allowed_dir]
+        allowed = [layout.allowed]
 
         # File inside allowed dir should be accepted
         assert is_safe_path(allowed_file, allowed), "File in allowed dir should be accepted"
@@ -113,119 +229,58 @@ class TestPathTraversalPrevention:
             outside_file, allowed
         ), "File outside allowed dir should be rejected"
 
-    @pytest.mark.security
-    def test_symlink_resolution(self, tmp_path: Path) -> None:
+    @pytest.mark.skipif(not _can_symlink(), reason="Cannot create symlinks on this system")
+    def test_symlink_resolution(self, layout: SimpleNamespace, tmp_path: Path) -> None:
         """Test that symlinks pointing outside allowed dirs are rejected."""
-        # Create allowed directory with a file
-        allowed_dir = tmp_path / "allowed"
-        allowed_dir.mkdir()
-
-        # Create a directory outside allowed
-        outside_dir = tmp_path / "outside"
-        outside_dir.mkdir()
-        outside_file = outside_dir / "secret.txt"
-        outside_file.write_text("secret")
-
-        # Create symlink inside allowed dir pointing to outside
-        symlink_path = allowed_dir / "sneaky_link"
+        # Create symlink in a private allowed dir pointing into the shared layout's outside dir
+        symlink_path = tmp_path / "sneaky_link"
         try:
-            symlink_path.symlink_to(outside_file)
+            symlink_path.symlink_to(layout.outside / "secret.txt")
         except OSError:
             pytest.skip("Cannot create symlinks on this system")
 
-        allowed = [allowed_dir]
+        allowed = [tmp_path]
 
         # The symlink's resolved path is outside allowed dirs
         assert not is_safe_path(
             symlink_path, allowed
         ), "Symlink escaping allowed dir should be rejected"
 
-    @pytest.mark.security
-    @pytest.mark.parametrize(
-        "dangerous_system_path",
-        [
-            "/etc",
-            "/proc",
-            "/sys",
-            "/dev",
-            "/boot",
-            "C:\\Windows",
-            "C:\\System32",
-            "C:\\Program Files",
-        ],
-    )
-    def test_rejects_dangerous_system_paths(self, dangerous_system_path: str) -> None:
+    def test_rejects_dangerous_system_paths(self, cwd_allowed: list[Path]) -> None:
         """Test that known dangerous system paths are rejected."""
-        allowed = [Path.cwd()]  # Normal working directory
-        assert not is_safe_path(
-            dangerous_system_path, allowed
-        ), f"Should reject dangerous system path: {dangerous_system_path}"
+        accepted = [path for path in DANGEROUS_SYSTEM_PATHS if is_safe_path(path, cwd_allowed)]
+        assert not accepted, f"Should reject dangerous system path: {accepted}"
 
 
 class TestGlobExpansionSecurity:
     """Test suite for secure glob pattern expansion."""
 
-    @pytest.mark.security
-    @pytest.mark.parametrize(
-        "malicious_glob",
-        [
-            # Path traversal in glob
-            "../*.mp4",
-            "../../*.mp4",
-            "/**/*.mp4",  # Root glob
-            "/etc/*",
-            "/proc/*",
-            # Dangerous system directories
-            "/etc/passwd*",
-            "/sys/**/*",
-            "~/.ssh/*",
-            "~/.aws/*",
-            # Excessive wildcards (potential DoS)
-            "**********",
-            "{" * 5 + "test" + "}" * 5,
-            # Windows paths
-            "C:\\Windows\\*",
-            "C:\\System32\\*",
-        ],
-    )
-    def test_rejects_malicious_glob_patterns(
-        self, malicious_glob: str, tmp_path: Path
-    ) -> None:
+    def test_rejects_malicious_glob_patterns(self, allowed_root: Path) -> None:
         """Test that malicious glob patterns are rejected or return empty."""
-        allowed = [tmp_path]
-        result = expand_globs([malicious_glob], allowed)
-        assert len(result) == 0, f"Should reject or return empty for: {malicious_glob}"
+        allowed = [allowed_root]
+        expanded = {pattern: expand_globs([pattern], allowed) for pattern in MALICIOUS_GLOBS}
+        accepted = {pattern: result for pattern, result in expanded.items() if result}
+        assert not accepted, f"Should reject or return empty for: {list(accepted)}"
 
-    @pytest.mark.security
-    def test_glob_results_validated_against_allowed_dirs(self, tmp_path: Path) -> None:
+    def test_glob_results_validated_against_allowed_dirs(self, layout: SimpleNamespace) -> None:
         """Test that glob results are validated against allowed directories."""
-        # Create files in allowed and not-allowed directories
-        allowed_dir = tmp_path / "allowed"
-        allowed_dir.mkdir()
-        (allowed_dir / "video1.mp4").touch()
-        (allowed_dir / "video2.mp4").touch()
-
-        outside_dir = tmp_path / "outside"
-        outside_dir.mkdir()
-        (outside_dir / "video3.mp4").touch()
-
         # Only allow the 'allowed' directory
-        allowed = [allowed_dir]
+        allowed = [layout.allowed]
 
         # Glob from allowed directory
-        results = expand_globs([str(allowed_dir / "*.mp4")], allowed)
+        results = expand_globs([str(layout.allowed / "*.mp4")], allowed)
 
         # Should only return files from allowed directory
         assert len(results) == 2
         for path in results:
-            assert path.parent == allowed_dir
+            assert path.parent == layout.allowed
 
-    @pytest.mark.security
     def test_glob_limit_prevents_dos(self, tmp_path: Path) -> None:
         """Test that glob results are limited to prevent DoS attacks."""
-        # Create many files
+        # Create many empty files with raw os.open calls (no per-file Path objects or stat)
+        prefix = f"{tmp_path}{os.sep}video_"
         for i in range(100):
-            (tmp_path / f"video_{i:03d}.mp4").touch()
+            os.close(os.open(f"{prefix}{i:03d}.mp4", os.O_CREAT | os.O_WRONLY, 0o600))
 
         allowed = [tmp_path]
         results = expand_globs([str(tmp_path / "*.mp4")], allowed)
@@ -237,59 +292,21 @@ class TestGlobExpansionSecurity:
 class TestFilenamesSanitization:
     """Test suite for filename sanitization."""
 
-    @pytest.mark.security
     @pytest.mark.parametrize(
         "malicious_filename,expected_sanitized",
-        [
-            # Path traversal in filename
-            ("../../../etc/passwd.mp4", "etc_passwd.mp4"),
-            ("..\\..\\windows\\system.mp4", "windows_system.mp4"),
-            # Shell characters
-            ("video;rm -rf /.mp4", "video_rm_-rf_.mp4"),
-            ("video|cat /etc/passwd.mp4", "video_cat_etc_passwd.mp4"),
-            ("video`whoami`.mp4", "video_whoami_.mp4"),
-            ("video$(ls).mp4", "video__ls_.mp4"),
-            # Null bytes
-            ("video\x00.mp4", "video.mp4"),
-            # Control characters
-            ("video\x01\x02\x03.mp4", "video.mp4"),
-            # Reserved Windows names
-            ("CON.mp4", "safe_CON.mp4"),
-            ("PRN.mp4", "safe_PRN.mp4"),
-            ("AUX.mp4", "safe_AUX.mp4"),
-            ("NUL.mp4", "safe_NUL.mp4"),
-            ("COM1.mp4", "safe_COM1.mp4"),
-            ("LPT1.mp4", "safe_LPT1.mp4"),
-            # Multiple dots (potential extension confusion)
-            ("video..mp4", "video.mp4"),
-            ("video...mp4", "video.mp4"),
-            # Leading/trailing dots
-            (".hidden.mp4", "hidden.mp4"),
-            ("video.", "video"),
-            # Empty or whitespace
-            ("   ", "sanitized_file"),
-            ("", "sanitized_file"),
-        ],
+        SANITIZE_CASES,
+        ids=[f"case_{i}" for i in range(len(SANITIZE_CASES))],
     )
     def test_sanitizes_dangerous_filenames(
         self, malicious_filename: str, expected_sanitized: str
     ) -> None:
         """Test that dangerous filenames are properly sanitized."""
-        from mediallm.processing.media_file_handler import sanitize_filename
-
         result = sanitize_filename(malicious_filename)
         # Check that dangerous characters are removed
-        assert ".." not in result
-        assert "\x00" not in result
-        assert ";" not in result
-        assert "|" not in result
-        assert "`" not in result
+        assert not FORBIDDEN_SANITIZED_RE.search(result), f"Contains forbidden characters: {result!r}"
 
-    @pytest.mark.security
     def test_sanitize_preserves_valid_characters(self) -> None:
         """Test that sanitization preserves valid filename characters."""
-        from mediallm.processing.media_file_handler import sanitize_filename
-
         valid_filename = "my_video-file.final.mp4"
         result = sanitize_filename(valid_filename)
 
@@ -298,11 +315,8 @@ class TestFilenamesSanitization:
         assert "file" in result
         assert ".mp4" in result
 
-    @pytest.mark.security
     def test_sanitize_truncates_long_filenames(self) -> None:
         """Test that very long filenames are truncated safely."""
-        from mediallm.processing.media_file_handler import sanitize_filename
-
         long_filename = "a" * 300 + ".mp4"
         result = sanitize_filename(long_filename)
 